@@ -1,4 +1,4 @@
-import requests
+import http_client
 import sys
 import urllib3
 import json
@@ -78,7 +78,7 @@ def fetch_playlist(url):
     }
 
     try:
-        response = requests.get(
+        response = http_client.get(
             url,
             headers=headers,
             timeout=30,
@@ -111,7 +111,7 @@ def get_playlist4():
             "Chrome/11.0.696.34 Safari/534.24"
         )
 
-        r = requests.get(
+        r = http_client.get(
             JSON_URL,
             headers={"User-Agent": UA},
             timeout=30,
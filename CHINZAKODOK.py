@@ -2,10 +2,11 @@ import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone, timedelta
-from deep_translator import GoogleTranslator
 from pathlib import Path
 from urllib.parse import urlparse
 
+from batch_translate import translate_many_async
+
 # ==========================
 # Timezone
 # ==========================
@@ -43,15 +44,6 @@ HEADERS = {
 }
 
 
-async def translate_zh_to_en(text):
-    if not text:
-        return ""
-    try:
-        return GoogleTranslator(source='zh-CN', target='en').translate(text)
-    except Exception as e:
-        print(f"Translate error for '{text}': {e}")
-        return text
-
 def safe_url(url):
     try:
         p = urlparse(url)
@@ -112,6 +104,7 @@ async def fetch_html(session, url):
 async def parse_matches(html):
     soup = BeautifulSoup(html, "html.parser")
     lines = []
+    parsed = []
 
     a_tags = soup.select("a.clearfix")
     if not a_tags:
@@ -134,10 +127,6 @@ async def parse_matches(html):
         home_team = home_div.p.text.strip() if home_div and home_div.p else ""
         away_team = away_div.p.text.strip() if away_div and away_div.p else ""
 
-        # Translate nama tim
-        home_team_en = await translate_zh_to_en(home_team)
-        away_team_en = await translate_zh_to_en(away_team)
-
         # Skor
         score_div = section.find("div", class_="bifeng")
         scores = score_div.get_text(separator=":").strip() if score_div else "vs"
@@ -163,6 +152,19 @@ async def parse_matches(html):
             print(f"⚠️ Time parse error for {data_time} {event_time}: {e}")
             dt_str = f"{data_time}-{event_time}"
 
+        parsed.append((match_id, home_team, away_team, liga_name, dt_str))
+
+    # Translate semua nama tim unik sekaligus (batch, di luar event loop)
+    translated = await translate_many_async(
+        [team for _, home, away, _, _ in parsed for team in (home, away)],
+        source="zh-CN",
+        target="en",
+    )
+
+    for match_id, home_team, away_team, liga_name, dt_str in parsed:
+        home_team_en = translated.get(home_team, home_team)
+        away_team_en = translated.get(away_team, away_team)
+
         # Format M3U
         title = f"{home_team_en} vs {away_team_en} ({liga_name})"
         lines.append(f'#EXTINF:-1 group-title="⚽️| LIVE EVENT" tvg-logo="{LOGO_URL}", {dt_str} {title}')
@@ -1,16 +1,20 @@
 import asyncio
 import re
-from urllib.parse import urlparse, urljoin
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse, urljoin, urlunparse, parse_qsl, urlencode
 from playwright.async_api import async_playwright
 import aiohttp
 import requests
 from bs4 import BeautifulSoup
 import json
 import ssl
+import time
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import urllib3   
 
+from stream_expiry import plan_refresh, parse_expiry_info
+
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -29,6 +33,25 @@ CF_CLEARANCE = config_vars.get("CF_CLEARANCE")
 OUTPUT_FILE = "map6.json"
 TABS = ["football", "basketball", "volleyball", "badminton", "tennis"]
 
+# jumlah context Playwright yang jalan bersamaan
+POOL_SIZE = int(config_vars.get("POOL_SIZE", 4))
+
+# refresh inkremental: URL lama yang masih berlaku dipakai ulang
+FULL_REFRESH = bool(config_vars.get("FULL_REFRESH", False))
+REFRESH_MARGIN = int(config_vars.get("REFRESH_MARGIN", 15 * 60))
+
+# cache iframe -> stream; kosongkan untuk cache per-run saja
+IFRAME_CACHE_FILE = config_vars.get("IFRAME_CACHE_FILE")
+# umur maksimal (detik) entry cache yang expiry-nya tidak bisa dibaca dari URL
+IFRAME_CACHE_TTL = int(config_vars.get("IFRAME_CACHE_TTL", 20 * 60))
+
+# jendela kickoff (jam) relatif terhadap sekarang, di luar ini slug tidak di-resolve
+WINDOW_PAST_HOURS = float(config_vars.get("WINDOW_PAST_HOURS", 3))
+WINDOW_AHEAD_HOURS = float(config_vars.get("WINDOW_AHEAD_HOURS", 12))
+
+# jam di slug memakai waktu Vietnam (UTC+7)
+SLUG_TZ = timezone(timedelta(hours=7))
+
 sslcontext = ssl.create_default_context()
 sslcontext.check_hostname = False
 sslcontext.verify_mode = ssl.CERT_NONE
@@ -73,15 +96,39 @@ def normalize_slug(href: str):
 
 
 # ====================================================
-# PLAYWRIGHT STREAM
+# BROWSER POOL
 # ====================================================
-async def playwright_fetch_stream(page_url: str, headless=True):
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=headless,
-            args=["--no-sandbox", "--disable-setuid-sandbox"]
-        )
-        context = await browser.new_context(
+class ContextPool:
+    """Satu Chromium untuk seluruh run, dengan sejumlah context terisolasi.
+
+    Setiap context sudah membawa cookie cf_clearance + EXTRA_HEADERS.
+    Context yang crash/error diganti baru tanpa menutup browser.
+    """
+
+    def __init__(self, playwright, size=POOL_SIZE, headless=True):
+        self.playwright = playwright
+        self.size = size
+        self.headless = headless
+        self.browser = None
+        self._idle = asyncio.Queue()
+        self._launch_lock = asyncio.Lock()
+        self._start_lock = asyncio.Lock()
+        self._started = False
+
+    async def _launch(self):
+        async with self._launch_lock:
+            if self.browser and self.browser.is_connected():
+                return
+            self.browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                args=["--no-sandbox", "--disable-setuid-sandbox"]
+            )
+
+    async def _new_context(self):
+        if not self.browser or not self.browser.is_connected():
+            await self._launch()
+
+        context = await self.browser.new_context(
             user_agent=EXTRA_HEADERS["user-agent"],
             viewport={"width": 1280, "height": 800},
         )
@@ -95,21 +142,250 @@ async def playwright_fetch_stream(page_url: str, headless=True):
             "path": "/",
             "secure": True,
         }])
+        return context
+
+    async def start(self):
+        async with self._start_lock:
+            if self._started:
+                return
+            await self._launch()
+            for _ in range(self.size):
+                self._idle.put_nowait(await self._new_context())
+            self._started = True
+        print(f"🧩 Browser pool siap: {self.size} context")
+
+    async def _replace(self, context):
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+        try:
+            return await self._new_context()
+        except Exception as e:
+            print(f"⚠️ Gagal restart context: {e}")
+            return None
+
+    @asynccontextmanager
+    async def context(self):
+        # browser baru diluncurkan saat pertama kali dibutuhkan
+        if not self._started:
+            await self.start()
+
+        context = await self._idle.get()
+        if context is None:
+            try:
+                context = await self._new_context()
+            except BaseException:
+                # kembalikan slot supaya pool tidak menyusut
+                self._idle.put_nowait(None)
+                raise
+
+        broken = False
+        try:
+            yield context
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            if broken:
+                print("♻️ Context error, restart context...")
+                context = await self._replace(context)
+            self._idle.put_nowait(context)
+
+    async def close(self):
+        while not self._idle.empty():
+            context = self._idle.get_nowait()
+            if context is None:
+                continue
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+        if self.browser:
+            await self.browser.close()
+
+
+# ====================================================
+# STREAM PARSER
+# ====================================================
+def clean_stream_url(stream_url: str):
+    if stream_url.startswith("https://live3.procdnlive.com/"):
+        stream_url = stream_url.replace("https://", "http://")
+    return stream_url
+
+
+def extract_stream_url(html: str):
+    m = re.search(r'var\s+urlStream\s*=\s*"([^"]+)"', html)
+    if m:
+        return clean_stream_url(m.group(1).replace("\\/", "/"))
+
+    m2 = re.search(r'https?://[^"\']+\.(m3u8|flv)', html)
+    if m2:
+        return clean_stream_url(m2.group(0))
+
+    return None
+
+
+# ====================================================
+# IFRAME CACHE
+# ====================================================
+def normalize_iframe_url(src: str, base: str):
+    url = urljoin(base, src.strip())
+    p = urlparse(url)
+    query = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+    return urlunparse((p.scheme.lower() or "https", p.netloc.lower(), p.path or "/", "", query, ""))
+
+
+class IframeCache:
+    """Cache iframe src (ternormalisasi) -> stream URL untuk satu run.
+
+    Slug player yang memakai iframe sama tidak me-load iframe lagi; yang
+    datang bersamaan menunggu hasil resolve pertama. Kalau `path` diisi,
+    entry yang belum expired disimpan dan dipakai lagi di run berikutnya;
+    URL tanpa expiry (atau yang expiry-nya cuma perkiraan dari waktu terbit)
+    hanya dipakai selama `ttl` detik.
+    """
+
+    def __init__(self, path=None, ttl=IFRAME_CACHE_TTL):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self.data = {}
+        self.saved_at = {}
+        self.hits = 0
+        self._inflight = {}
+
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                now = time.time()
+                for key, entry in saved.items():
+                    # format lama: langsung string URL
+                    if isinstance(entry, str):
+                        entry = {"url": entry, "saved_at": 0}
+                    if self._usable(entry["url"], entry.get("saved_at", 0), now):
+                        self.data[key] = entry["url"]
+                        self.saved_at[key] = entry.get("saved_at", 0)
+                print(f"🗃️ Iframe cache: {len(self.data)} entry dimuat")
+            except Exception as e:
+                print(f"⚠️ Gagal baca iframe cache: {e}")
+
+    def _usable(self, url, saved_at, now):
+        info = parse_expiry_info(url)
+        if info is None:
+            return now - saved_at < self.ttl
+        exp, from_issue_time = info
+        if from_issue_time:
+            # expiry hanya perkiraan (waktu terbit + TTL), batasi juga dengan umur cache
+            return now - saved_at < self.ttl and exp - now > REFRESH_MARGIN
+        return exp - now > REFRESH_MARGIN
+
+    async def resolve(self, iframe_url, loader):
+        if iframe_url in self.data:
+            self.hits += 1
+            return self.data[iframe_url]
+
+        pending = self._inflight.get(iframe_url)
+        if pending:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight[iframe_url] = pending
+
+        stream_url = None
+        try:
+            stream_url = await loader()
+        finally:
+            self._inflight.pop(iframe_url, None)
+            if not pending.done():
+                pending.set_result(stream_url)
+            if stream_url:
+                self.data[iframe_url] = stream_url
+                self.saved_at[iframe_url] = time.time()
+
+        return stream_url
+
+    def save(self):
+        if not self.path:
+            return
+        data = {
+            key: {"url": url, "saved_at": self.saved_at.get(key, 0)}
+            for key, url in self.data.items()
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# ====================================================
+# HTTP STREAM (tanpa browser)
+# ====================================================
+async def http_get_text(session, url, referer=None):
+    headers = {"referer": referer} if referer else None
+
+    async with session.get(
+        url,
+        headers=headers,
+        cookies={"cf_clearance": CF_CLEARANCE},
+        ssl=sslcontext,
+        timeout=aiohttp.ClientTimeout(total=15),
+    ) as resp:
+        if resp.status != 200:
+            return None
+        return await resp.text(errors="ignore")
 
-        page = await context.new_page()
+
+async def http_fetch_stream(session, cache: IframeCache, page_url: str):
+    """Ambil urlStream langsung dari HTML iframe, tanpa Playwright."""
+    html = await http_get_text(session, page_url)
+    if not html:
+        return None
+
+    soup = BeautifulSoup(html, "html.parser")
+    iframe = soup.select_one("iframe#iframe-stream") or soup.select_one("iframe")
+    if not iframe or not iframe.get("src"):
+        return None
+
+    iframe_src = urljoin(page_url, iframe["src"])
+
+    async def load():
+        iframe_html = await http_get_text(session, iframe_src, referer=page_url)
+        if not iframe_html:
+            return None
+        return extract_stream_url(iframe_html)
+
+    return await cache.resolve(normalize_iframe_url(iframe_src, page_url), load)
+
+
+# ====================================================
+# PLAYWRIGHT STREAM
+# ====================================================
+async def playwright_fetch_stream(context, cache: IframeCache, page_url: str):
+    page = await context.new_page()
+
+    try:
         await page.goto(page_url, timeout=60000)
         await asyncio.sleep(2)
 
         iframe = await page.query_selector("iframe#iframe-stream") or await page.query_selector("iframe")
         if not iframe:
-            await browser.close()
             return None
 
         iframe_src = await iframe.get_attribute("src")
         if not iframe_src:
-            await browser.close()
             return None
 
+    finally:
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    iframe_src = urljoin(page_url, iframe_src)
+
+    async def load():
         parsed = urlparse(iframe_src)
         if parsed.hostname:
             await context.add_cookies([{
@@ -121,29 +397,19 @@ async def playwright_fetch_stream(page_url: str, headless=True):
             }])
 
         iframe_page = await context.new_page()
-        await iframe_page.set_extra_http_headers({**EXTRA_HEADERS, "referer": page_url})
-        await iframe_page.goto(iframe_src, timeout=60000, wait_until="networkidle")
-
-        html = await iframe_page.content()
-
-        m = re.search(r'var\s+urlStream\s*=\s*"([^"]+)"', html)
-        if m:
-            stream_url = m.group(1).replace("\\/", "/")
-            if stream_url.startswith("https://live3.procdnlive.com/"):
-                stream_url = stream_url.replace("https://", "http://")
-            await browser.close()
-            return stream_url
-
-        m2 = re.search(r'https?://[^"\']+\.(m3u8|flv)', html)
-        if m2:
-            stream_url = m2.group(0)
-            if stream_url.startswith("https://live3.procdnlive.com/"):
-                stream_url = stream_url.replace("https://", "http://")
-            await browser.close()
-            return stream_url
-
-        await browser.close()
-        return None
+        try:
+            await iframe_page.set_extra_http_headers({**EXTRA_HEADERS, "referer": page_url})
+            await iframe_page.goto(iframe_src, timeout=60000, wait_until="networkidle")
+            html = await iframe_page.content()
+        finally:
+            try:
+                await iframe_page.close()
+            except Exception:
+                pass
+
+        return extract_stream_url(html)
+
+    return await cache.resolve(normalize_iframe_url(iframe_src, page_url), load)
 
 
 # ====================================================
@@ -168,6 +434,30 @@ def parse_datetime_key(slug: str):
     return datetime.min
 
 
+def plan_slugs(slugs, now=None):
+    """Buang slug di luar jendela kickoff, sisanya urut dari kickoff terdekat.
+
+    Slug tanpa waktu yang bisa dibaca tetap ikut, di urutan paling belakang.
+    """
+    now = now or datetime.now(SLUG_TZ).replace(tzinfo=None)
+    earliest = now - timedelta(hours=WINDOW_PAST_HOURS)
+    latest = now + timedelta(hours=WINDOW_AHEAD_HOURS)
+
+    timed, untimed, dropped = [], [], 0
+    for slug in slugs:
+        kickoff = parse_datetime_key(slug)
+        if kickoff == datetime.min:
+            untimed.append(slug)
+        elif earliest <= kickoff <= latest:
+            timed.append((abs(kickoff - now), slug))
+        else:
+            dropped += 1
+
+    timed.sort(key=lambda x: x[0])
+    print(f"🗓️ Jendela kickoff: {len(timed)} masuk, {dropped} dibuang, {len(untimed)} tanpa waktu")
+    return [slug for _, slug in timed] + untimed
+
+
 def parse_title_from_slug(slug: str):
     title_part = re.sub(r"^truc-tiep[-/]*", "", slug)
     title_part = re.sub(r"-luc-\d{3,4}-ngay-\d{1,2}-\d{1,2}-\d{4}$", "", title_part)
@@ -244,25 +534,36 @@ def get_all_slugs():
         print(f"✅ {tab}: ditemukan {len(found)} slug")
         results.extend(found)
 
-    results = sorted(results, key=parse_datetime_key, reverse=True)
     print(f"📦 Total slug utama: {len(results)}")
+    results = plan_slugs(results)
     return results
 
 
 # ====================================================
 # PLAYWRIGHT WRAPPER
 # ====================================================
-async def fetch_stream_url(session, slug, retries=2):
+async def fetch_stream_url(session, pool, cache, slug, retries=2):
     full_url = f"{BASE_URL.rstrip('/')}/{slug}"
 
+    # coba jalur HTTP dulu, Playwright hanya fallback
+    try:
+        stream_url = await http_fetch_stream(session, cache, full_url)
+        if stream_url:
+            print(f"⚡ HTTP {slug} → {stream_url}")
+            return slug, stream_url
+    except Exception as e:
+        print(f"⚠️ HTTP gagal {slug}: {e}")
+
     for attempt in range(1, retries + 1):
         try:
             print(f"🌐 Playwright: {slug} (percobaan {attempt})")
 
-            stream_url = await asyncio.wait_for(
-                playwright_fetch_stream(full_url),
-                timeout=90
-            )
+            # timeout dihitung setelah dapat context, bukan selama antre
+            async with pool.context() as context:
+                stream_url = await asyncio.wait_for(
+                    playwright_fetch_stream(context, cache, full_url),
+                    timeout=90
+                )
 
             if stream_url:
                 print(f"🎯 {slug} → {stream_url}")
@@ -294,21 +595,50 @@ async def main():
 
     print(f"\n📌 Total slug final (+ player): {len(expanded_slugs)}\n")
 
+    old_data = {}
+    if not FULL_REFRESH and Path(OUTPUT_FILE).exists():
+        try:
+            with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+                old_data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Gagal baca {OUTPUT_FILE}: {e}")
+
+    kept, todo_slugs = plan_refresh(old_data, expanded_slugs, margin=REFRESH_MARGIN)
+    print(f"♻️ Masih valid: {len(kept)} | Perlu resolve: {len(todo_slugs)}\n")
+
     new_results = {}
 
-    async with aiohttp.ClientSession(headers=COMMON_HEADERS) as aio:
-        for slug in expanded_slugs:
-            s, url = await fetch_stream_url(aio, slug)
+    async with aiohttp.ClientSession(headers=COMMON_HEADERS) as aio, async_playwright() as p:
+        pool = ContextPool(p, size=POOL_SIZE)
+        cache = IframeCache(IFRAME_CACHE_FILE)
+
+        try:
+            # pool membatasi jumlah slug yang diproses bersamaan
+            results = await asyncio.gather(*[
+                fetch_stream_url(aio, pool, cache, slug)
+                for slug in todo_slugs
+            ])
+        finally:
+            await pool.close()
+
+        print(f"🗃️ Iframe cache hit: {cache.hits}")
+        cache.save()
+
+        for s, url in results:
             if url:
                 new_results[s] = url
                 print(f"💾 [{parse_time_from_slug(s)}] {parse_title_from_slug(s)}")
             else:
                 print(f"⏭️ Lewati {s} (tidak ada stream valid)")
 
+    # urutan mengikuti daftar slug, entry lama yang tidak tampil lagi dibuang
+    combined = {**kept, **new_results}
+    ordered = {s: combined[s] for s in expanded_slugs if s in combined}
+
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(new_results, f, indent=2, ensure_ascii=False)
+        json.dump(ordered, f, indent=2, ensure_ascii=False)
 
-    print("\n✅ map6.json berhasil di-rewrite total.")
+    print(f"\n✅ map6.json disimpan: {len(ordered)} stream ({len(new_results)} baru).")
 
 
 if __name__ == "__main__":
@@ -1,4 +1,3 @@
-import requests
 import urllib.parse
 import json
 from bs4 import BeautifulSoup
@@ -7,6 +6,10 @@ from pytz import timezone
 from pathlib import Path
 import urllib3
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+from proxy_list import load_proxy_list
+from proxy_pool import ProxyPool
 
 # Matikan peringatan SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -47,33 +50,17 @@ class JetItem:
 # Proxy
 # =========================
 def load_proxies():
-    try:
-        print("🌐 Mengambil daftar proxy...")
-        resp = requests.get(PROXY_LIST_URL, timeout=10)
-        resp.raise_for_status()
-        return [p.strip() for p in resp.text.splitlines() if p.strip()]
-    except Exception as e:
-        print(f"⚠️ Gagal ambil proxy: {e}")
-        return []
+    print("🌐 Mengambil daftar proxy...")
+    return load_proxy_list(PROXY_LIST_URL, timeout=10)
 
-def safe_get(url, proxies, timeout=10):
-    for p in proxies:
-        proxy = {"http": p, "https": p}
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=timeout, proxies=proxy, verify=False)
-            if r.status_code == 200:
-                print(f"↪️ OK: {url} via {p}")
-                return r.text
-        except Exception:
-            continue
-    print(f"❌ Gagal ambil {url} dengan semua proxy.")
-    return None
+def safe_get(url, pool):
+    return pool.get(url)
 
 # =========================
 # Ambil link .m3u8
 # =========================
-def get_links(live_url, proxies):
-    html = safe_get(live_url, proxies)
+def get_links(live_url, pool):
+    html = safe_get(live_url, pool)
     if not html:
         return []
 
@@ -98,7 +85,7 @@ def get_links(live_url, proxies):
 # =========================
 # Parsing HTML
 # =========================
-def parse_item(m, dt, proxies):
+def parse_item(m, dt):
     t1 = m.select_one("span.name-team-left").text.strip()
     t2 = m.select_one("span.name-team-right").text.strip()
     title = f"{t1} vs {t2}"
@@ -113,22 +100,28 @@ def parse_item(m, dt, proxies):
     full_url = href.get("href")
     full_url = full_url if full_url.startswith("http") else f"https://{DOMAIN}{full_url}"
 
-    links = get_links(full_url, proxies)
-    return JetItem(title, links, league, dt, page_url=full_url)
+    return JetItem(title, [], league, dt, page_url=full_url)
 
-def parse_html(html, selector, item_parser, proxies):
+def parse_html(html, selector, item_parser):
     soup = BeautifulSoup(html, "html.parser")
     items = []
     for m in soup.select(selector):
         try:
             ts = int(m.select_one(".time-format")["data-time"]) // 1000
             dt = datetime.fromtimestamp(ts, tz=wib)
-            items.append(item_parser(m, dt, proxies))
+            items.append(item_parser(m, dt))
         except Exception as e:
             print("⚠️ Parse error:", e)
             continue
     return items
 
+def fetch_all_links(items, pool):
+    # halaman detail diambil paralel, tersebar di proxy yang sehat
+    with ThreadPoolExecutor(max_workers=min(pool.workers, 8)) as executor:
+        results = executor.map(lambda item: get_links(item.page_url, pool), items)
+        for item, links in zip(items, results):
+            item.links = links
+
 # =========================
 # Simpan JSON
 # =========================
@@ -156,8 +149,12 @@ def main():
     if not proxies:
         return
 
-    playing_html = safe_get(f"https://{DOMAIN}/playing.html", proxies)
-    playing = parse_html(playing_html, "div.row-item-match", parse_item, proxies) if playing_html else []
+    pool = ProxyPool(proxies, headers=HEADERS)
+    pool.probe(f"https://{DOMAIN}/")
+
+    playing_html = safe_get(f"https://{DOMAIN}/playing.html", pool)
+    playing = parse_html(playing_html, "div.row-item-match", parse_item) if playing_html else []
+    fetch_all_links(playing, pool)
 
     print(f"\n📡 Total Live Match: {len(playing)}")
     for item in playing:
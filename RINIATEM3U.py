@@ -1,7 +1,7 @@
 from zoneinfo import ZoneInfo
 from datetime import datetime, timedelta, date
 from pathlib import Path
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import urllib3
 
@@ -41,7 +41,7 @@ class JetItem:
 # ==========================
 def safe_get(url):
     try:
-        r = requests.get(
+        r = http_client.get(
             url,
             headers=AESPORT_HEADERS,
             timeout=AESPORT_TIMEOUT,
@@ -5,6 +5,8 @@ from pathlib import Path
 from urllib.parse import urljoin, urlparse, quote
 import urllib3
 
+from translation_memory import get_memory
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # ====== Load konfigurasi ======
@@ -42,13 +44,19 @@ def proxied_get(url):
 def translate(text):
     if not text:
         return text
+    memory = get_memory()
+    remembered = memory.get(text, "vi", "en")
+    if remembered:
+        return remembered
     try:
         url = (
             "https://translate.googleapis.com/translate_a/single"
             f"?client=gtx&sl=vi&tl=en&dt=t&q={quote(text)}"
         )
         data = proxied_get(url).json()
-        return data[0][0][0]
+        result = data[0][0][0]
+        memory.put(text, result, "vi", "en")
+        return result
     except:
         return text
 
@@ -0,0 +1,87 @@
+import asyncio
+
+from deep_translator import GoogleTranslator
+
+from translation_memory import get_memory
+
+# ==========================
+# KONFIGURASI
+# ==========================
+# batas deep_translator 5000 karakter per request, sisakan ruang
+MAX_CHARS = 4500
+SEPARATOR = "\n"
+
+
+# ==========================
+# Batch
+# ==========================
+def chunk_texts(texts, max_chars=MAX_CHARS):
+    chunk, size = [], 0
+    for text in texts:
+        extra = len(text) + len(SEPARATOR)
+        if chunk and size + extra > max_chars:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(text)
+        size += extra
+    if chunk:
+        yield chunk
+
+
+def translate_chunk(translator, chunk):
+    """Terjemahkan satu chunk dalam satu request, per item kalau baris tidak cocok."""
+    try:
+        translated = translator.translate(SEPARATOR.join(chunk))
+        parts = translated.split(SEPARATOR) if translated else []
+        if len(parts) == len(chunk):
+            return [p.strip() or t for p, t in zip(parts, chunk)]
+        print(f"⚠️ Batch {len(chunk)} teks tidak sejajar, fallback per item")
+    except Exception as e:
+        print(f"Translate batch error: {e}")
+
+    results = []
+    for text in chunk:
+        try:
+            results.append(translator.translate(text) or text)
+        except Exception as e:
+            print(f"Translate error for '{text}': {e}")
+            results.append(text)
+    return results
+
+
+def translate_many(texts, source="zh-CN", target="en", cache=None):
+    """Terjemahkan banyak teks sekaligus: dedupe, batch, lalu map balik.
+
+    Hasil berupa dict {teks asli: terjemahan}. `cache` (dict) dipakai
+    dan diisi kalau diberikan.
+    """
+    cache = {} if cache is None else cache
+
+    texts = [(text or "").strip() for text in texts]
+    unique = [t for t in dict.fromkeys(texts) if t and t not in cache]
+
+    if unique:
+        memory = get_memory()
+        cache.update(memory.get_many(unique, source, target))
+        unique = [t for t in unique if t not in cache]
+
+    if unique:
+        translator = GoogleTranslator(source=source, target=target)
+        chunks = list(chunk_texts(unique))
+        print(f"🌐 Translate {len(unique)} teks unik dalam {len(chunks)} request")
+
+        fresh = {}
+        for chunk in chunks:
+            for text, result in zip(chunk, translate_chunk(translator, chunk)):
+                cache[text] = result
+                if result != text:
+                    fresh[text] = result
+
+        memory.put_many(fresh, source, target)
+
+    return {text: cache.get(text, text) for text in texts}
+
+
+async def translate_many_async(texts, source="zh-CN", target="en", cache=None):
+    """Versi async dari translate_many, jalan di thread terpisah dari event loop."""
+    return await asyncio.to_thread(translate_many, list(texts), source, target, cache)
@@ -0,0 +1,110 @@
+import asyncio
+
+from playwright.async_api import async_playwright
+
+from fetch_bodattv_html import collect_slugs, open_page, scroll_page
+from generate_map_bodattv import (
+    BASE_URL, OUTPUT_FILE, RESOLVE_WORKERS, extract_m3u8_from_iframe, resolve_slug, save_map
+)
+
+# =======================
+# 🔧 KONFIGURASI
+# =======================
+# halaman pertandingan tunggal: ada tombol server + iframe player
+SINGLE_MATCH_JS = "() => !!(document.querySelector('.btn-server') && document.querySelector('iframe[src]'))"
+IFRAME_SRC_JS = "() => { const f = document.querySelector('iframe[src]'); return f ? f.getAttribute('src') : null; }"
+
+
+# =======================
+# 🔧 PIPELINE
+# =======================
+class MapWriter:
+    """Kumpulkan hasil resolve dan tulis ulang map2.json setiap ada hasil baru,
+    urut sesuai slug ditemukan di halaman."""
+
+    def __init__(self, path=OUTPUT_FILE):
+        self.path = path
+        self.order = []
+        self.links = {}
+
+    def add_slug(self, slug):
+        self.order.append(slug)
+
+    def put(self, slug, link):
+        self.links[slug] = link
+        save_map({s: self.links[s] for s in self.order if s in self.links}, self.path)
+
+async def resolver(queue, writer):
+    while True:
+        slug = await queue.get()
+        if slug is None:
+            return
+        try:
+            link = await asyncio.to_thread(resolve_slug, slug)
+            if link:
+                writer.put(slug, link)
+                print(f"💾 {slug} → {link}")
+        except Exception as e:
+            print(f"⚠️ Gagal proses slug {slug}: {e}")
+
+async def single_match(page):
+    print("📺 Mode: halaman pertandingan tunggal")
+    try:
+        tab_button = await page.query_selector("button:has-text('Server')")
+        if tab_button:
+            print("🖱️ Klik tab 'Server'...")
+            await tab_button.click()
+            await page.wait_for_timeout(2000)
+    except Exception:
+        print("⚠️ Tidak ada tab 'Server' ditemukan.")
+
+    src = await page.evaluate(IFRAME_SRC_JS)
+    m3u8_links = extract_m3u8_from_iframe(src, BASE_URL) if src else []
+    save_map({"single_match": m3u8_links[0] if m3u8_links else None})
+
+async def main():
+    """Render halaman daftar, ambil slug dari DOM selama scroll dan langsung
+    resolve di background oleh RESOLVE_WORKERS worker (satu session
+    cloudscraper bersama); map2.json ditulis bertahap."""
+    queue = asyncio.Queue()
+    writer = MapWriter()
+    seen = set()
+
+    async def enqueue_new(page):
+        for slug in await collect_slugs(page):
+            if slug not in seen:
+                seen.add(slug)
+                writer.add_slug(slug)
+                queue.put_nowait(slug)
+
+    workers = [asyncio.create_task(resolver(queue, writer)) for _ in range(RESOLVE_WORKERS)]
+    try:
+        async with async_playwright() as p:
+            browser, page = await open_page(p)
+            try:
+                if await page.evaluate(SINGLE_MATCH_JS):
+                    await single_match(page)
+                    return
+
+                print("📋 Mode: halaman daftar pertandingan")
+                await enqueue_new(page)
+                print("📜 Scrolling halaman...")
+                await scroll_page(page, on_step=enqueue_new)
+                await enqueue_new(page)
+                print(f"🔍 Total slug ditemukan: {len(seen)}")
+            finally:
+                await browser.close()
+    finally:
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+
+    if not writer.links:
+        save_map({})
+    print(f"✅ Disimpan {len(writer.links)}/{len(seen)} link ke {OUTPUT_FILE}")
+
+# =======================
+# 🚀 JALANKAN
+# =======================
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,16 @@
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 from deep_translator import GoogleTranslator
 from pathlib import Path
 from pypinyin import lazy_pinyin
 import json
 
+import http_client
+from glossary import load_glossary
+from translation_memory import get_memory
+
 # ==========================
 # Load Config
 # ==========================
@@ -48,6 +54,19 @@ TARGET_LANG = "en"
 
 LIBRE_URL = "https://libretranslate.de/translate"
 
+# kamus nama liga/tim Mandarin -> Inggris (glossary/zh_en.json)
+ZH_GLOSSARY = load_glossary("zh_en", word_boundary=False)
+
+# kode sumber di translation memory: teks Mandarin, sama dengan batch_translate
+# (backend sendiri tetap deteksi otomatis)
+MEMORY_SOURCE = "zh-CN"
+
+# backend dimatikan sisa run setelah gagal berturut-turut sebanyak ini
+MAX_FAILURES = 3
+
+# kalau backend utama belum jawab setelah ini (detik), kirim juga ke tier berikutnya
+HEDGE_AFTER = 2.0
+
 
 def is_ascii(s):
     return all(ord(c) < 128 for c in s)
@@ -62,7 +81,7 @@ def to_pinyin(text):
 
 def libre_translate(text, target=TARGET_LANG):
     try:
-        r = requests.post(
+        r = http_client.post(
             LIBRE_URL,
             data={
                 "q": text,
@@ -81,6 +100,121 @@ def libre_translate(text, target=TARGET_LANG):
         return None
 
 
+def google_translate(text, target=TARGET_LANG):
+    return GoogleTranslator(
+        source="auto",
+        target=target
+    ).translate(text)
+
+
+# ==========================
+# Translate Router
+# ==========================
+class Backend:
+
+    def __init__(self, name, fn, max_failures=MAX_FAILURES):
+        self.name = name
+        self.fn = fn
+        self.max_failures = max_failures
+        self.failures = 0
+        self.calls = 0
+        self.ok = 0
+        self.total_time = 0.0
+        self.open = False
+        # call() dijalankan dari thread hedge, jadi counter & status dijaga lock
+        self._lock = threading.Lock()
+
+    def call(self, text, target):
+        start = time.monotonic()
+
+        try:
+            result = self.fn(text, target)
+        except Exception:
+            result = None
+
+        with self._lock:
+            self.calls += 1
+            self.total_time += time.monotonic() - start
+
+            if result:
+                self.ok += 1
+                self.failures = 0
+            else:
+                self.failures += 1
+                if self.failures >= self.max_failures and not self.open:
+                    self.open = True
+                    print(f"⛔ Translate backend {self.name} dimatikan ({self.failures}x gagal)")
+
+        return result
+
+    def is_open(self):
+        with self._lock:
+            return self.open
+
+    def stats(self):
+        with self._lock:
+            avg = self.total_time / self.calls if self.calls else 0
+            state = "OPEN" if self.open else "ok"
+        return f"{self.name}: {self.ok}/{self.calls} ok, avg {avg:.2f}s, {state}"
+
+
+class TranslationRouter:
+    """Coba backend berurutan, lewati yang circuit-nya terbuka.
+
+    Kalau backend aktif lambat (> hedge_after), tier berikutnya ikut
+    dijalankan bersamaan dan hasil valid pertama yang dipakai.
+    """
+
+    def __init__(self, backends, hedge_after=HEDGE_AFTER):
+        self.backends = backends
+        self.hedge_after = hedge_after
+        self.executor = ThreadPoolExecutor(max_workers=len(backends) * 2)
+
+    def translate(self, text, target):
+        queue = [b for b in self.backends if not b.is_open()]
+        running = {}
+
+        def launch():
+            backend = queue.pop(0)
+            running[self.executor.submit(backend.call, text, target)] = backend
+
+        if queue:
+            launch()
+
+        while running:
+            timeout = self.hedge_after if queue else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                launch()
+                continue
+
+            for fut in done:
+                running.pop(fut)
+                result = fut.result()
+                if result:
+                    return result
+
+            if queue and not running:
+                launch()
+
+        return None
+
+    def report(self):
+        for backend in self.backends:
+            print(f"📊 {backend.stats()}")
+
+    def close(self):
+        # hedge yang kalah tidak perlu ditunggu
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+router = TranslationRouter([
+    Backend("google", google_translate),
+    Backend("libre", libre_translate),
+])
+
+
 def translate_text(text, target=TARGET_LANG):
 
     if not text:
@@ -97,25 +231,27 @@ def translate_text(text, target=TARGET_LANG):
     if is_ascii(text):
         return text
 
-    try:
-        result = GoogleTranslator(
-            source="auto",
-            target=target
-        ).translate(text)
+    result = ZH_GLOSSARY.translate(text) if target == "en" else None
 
-        if result:
-            translate_cache[text] = result
-            return result
+    if result:
+        translate_cache[text] = result
+        return result
 
-    except:
-        pass
+    memory = get_memory()
 
-    result = libre_translate(text, target)
+    result = memory.get(text, MEMORY_SOURCE, target)
 
     if result:
         translate_cache[text] = result
         return result
 
+    result = router.translate(text, target)
+
+    if result:
+        translate_cache[text] = result
+        memory.put(text, result, MEMORY_SOURCE, target)
+        return result
+
     result = to_pinyin(text)
 
     translate_cache[text] = result
@@ -171,7 +307,7 @@ def safe_json_request(url, headers):
 
     try:
 
-        r = requests.get(
+        r = http_client.get(
             url,
             headers=headers,
             timeout=20
@@ -252,6 +388,9 @@ def main():
 
             f.write(stream_url + "\n\n")
 
+    router.report()
+    router.close()
+
     print("✅ CONGOR.m3u berhasil dibuat")
 
 
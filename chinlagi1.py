@@ -1,5 +1,5 @@
 from pathlib import Path
-import requests
+import http_client
 import json
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
@@ -130,7 +130,7 @@ def main():
     all_matches = []
     raw = None
     try:
-        resp = requests.get(
+        resp = http_client.get(
             WORKER_MATCHES,
             headers={"User-Agent": UA, "Referer": REFERER},
             timeout=15
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
-import requests
 import json
 import re
 from datetime import datetime, timedelta, timezone
 from deep_translator import GoogleTranslator
 from pathlib import Path
 
+import http_client
+from glossary import load_glossary
+from translation_memory import get_memory
+
 # ==========================
 # Load Config
 # ==========================
@@ -38,7 +41,7 @@ headers = {
 print(f"🕓 Fetching: {JSON_URL}")
 
 # ===== FETCH DAN BERSIHKAN JSON =====
-resp = requests.get(JSON_URL, headers=headers, timeout=15)
+resp = http_client.get(JSON_URL, headers=headers, timeout=15)
 resp.raise_for_status()
 raw_text = resp.text.strip()
 
@@ -57,6 +60,15 @@ translator = GoogleTranslator(source="auto", target="en")
 # Cache sederhana biar gak terjemah teks yang sama berulang
 translate_cache = {}
 
+# Memori terjemahan on-disk, dipakai bersama antar run & script.
+# Translator pakai "auto", tapi teksnya Mandarin: simpan dengan kode yang
+# sama seperti batch_translate supaya entry-nya terbagi.
+memory = get_memory()
+MEMORY_SOURCE = "zh-CN"
+
+# Kamus nama liga/tim, dicek dulu sebelum ke jaringan
+glossary = load_glossary("zh_en", word_boundary=False)
+
 
 def tr(text: str):
     """Terjemahkan teks dengan cache."""
@@ -64,8 +76,17 @@ def tr(text: str):
         return text
     if text in translate_cache:
         return translate_cache[text]
+    translated = glossary.translate(text)
+    if translated:
+        translate_cache[text] = translated
+        return translated
+    translated = memory.get(text, MEMORY_SOURCE, "en")
+    if translated:
+        translate_cache[text] = translated
+        return translated
     try:
         translated = translator.translate(text)
+        memory.put(text, translated, MEMORY_SOURCE, "en")
     except Exception:
         translated = text
     translate_cache[text] = translated
@@ -1,5 +1,5 @@
 import asyncio
-import requests
+import http_client
 from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 from pathlib import Path
@@ -45,7 +45,7 @@ def get_items():
         )
         print("🔎 Scraping:", url)
         try:
-            r = requests.get(url, headers=headers, timeout=20)
+            r = http_client.get(url, headers=headers, timeout=20)
             r.raise_for_status()
         except:
             continue
@@ -1,9 +1,8 @@
-import requests
-import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from zoneinfo import ZoneInfo  # Python 3.9+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
+from sterame3_snapshot import FeedSnapshot, event_time, recent_matches
+
 # Path ke file config
 CONFIG_FILE = Path.home() / "sterame3data_file.txt"
 
@@ -21,90 +20,118 @@ VLC_OPTS = config_globals.get("VLC_OPTS")
 USER_AGENT = config_globals.get("USER_AGENT")
 HEADERS = config_globals.get("HEADERS")
 
-# Kategori yang dilewatkan filter waktu
-EXEMPT_CATEGORIES = [
-    "fight",
-    "motor-sports",
-    "tennis"
-]
+# jumlah source yang cukup per match, source berikutnya hanya di-fetch kalau kurang
+SOURCES_PER_MATCH = config_globals.get("SOURCES_PER_MATCH", 1)
+
+# match & stream JSON dibagi dengan cinhodal1.py lewat snapshot on-disk
+snapshot = FeedSnapshot(MATCHES_URL, STREAM_URL, HEADERS)
 
 def fetch_stream(source_type, source_id):
     try:
-        url = STREAM_URL.format(source_type, source_id)
-        res = requests.get(url, headers=HEADERS, timeout=10)
-        res.raise_for_status()
-        return res.json()
+        return snapshot.streams(source_type, source_id, timeout=10)
     except Exception as e:
         print(f"⚠️ gagal fetch stream {source_type}/{source_id}: {e}")
         return []
 
+def fetch_streams_for(matches, executor):
+    """Fetch stream per match secara berantai: begitu source sebuah match gagal
+    atau kosong, source berikutnya untuk match itu langsung di-submit (tidak
+    menunggu match lain). Pasangan (source, id) yang sama di beberapa match
+    hanya di-fetch sekali dan hasilnya dipakai bersama.
+
+    Hasil: list (match, source_type, streams) urut match (kickoff), lalu urutan source.
+    """
+    futures = {}
+    waiting = {}
+    found = {id(m): [] for m in matches}
+    next_src = {id(m): 0 for m in matches}
+
+    def advance(match):
+        sources = match.get("sources", [])
+        while len(found[id(match)]) < SOURCES_PER_MATCH and next_src[id(match)] < len(sources):
+            src = sources[next_src[id(match)]]
+            next_src[id(match)] += 1
+            key = (src["source"], src["id"])
+
+            fut = futures.get(key)
+            if fut is None:
+                futures[key] = executor.submit(fetch_stream, *key)
+            elif fut.done() and key not in waiting:
+                # sudah di-fetch untuk match lain, pakai hasilnya langsung
+                if fut.result():
+                    found[id(match)].append((key[0], fut.result()))
+                continue
+            waiting.setdefault(key, []).append(match)
+            return
+
+    for match in matches:
+        advance(match)
+
+    while waiting:
+        done, _ = wait([futures[key] for key in waiting], return_when=FIRST_COMPLETED)
+        for key in [k for k in waiting if futures[k] in done]:
+            streams = futures[key].result()
+            for match in waiting.pop(key):
+                if streams:
+                    found[id(match)].append((key[0], streams))
+                advance(match)
+
+    print(f"📡 {len(futures)} request stream untuk {len(matches)} match")
+    return [(m, src, streams) for m in matches for src, streams in found[id(m)]]
+
 def main(apply_time_filter=True):
-    res = requests.get(MATCHES_URL, headers=HEADERS, timeout=15)
-    matches = res.json()
-    now = datetime.datetime.now(ZoneInfo("Asia/Jakarta"))
+    # filter waktu lewat 2 jam (kecuali kategori tertentu)
+    matches = recent_matches(snapshot.matches(timeout=15), apply_time_filter)
     playlist = "#EXTM3U\n"
-    tasks = {}
-    
-    with ThreadPoolExecutor(max_workers=15) as executor:
-        for match in matches:
-            # konversi waktu event
-            start_at = match["date"] / 1000
-            event_time_utc = datetime.datetime.fromtimestamp(start_at, ZoneInfo("UTC"))
-            event_time_local = event_time_utc.astimezone(ZoneInfo("Asia/Jakarta"))
-            
-            # filter waktu lewat 2 jam (kecuali kategori tertentu)
-            category = match.get("category", "").lower()
-            if apply_time_filter and category not in EXEMPT_CATEGORIES:
-                if event_time_local < (now - datetime.timedelta(hours=2)):
-                    continue
-            
-            match_time_str = event_time_local.strftime("%d/%m-%H.%M")
-            
-            # pilih judul
-            teams = match.get("teams")
-            if teams and "home" in teams and "away" in teams:
-                display_title = f"{teams['home']['name']} vs {teams['away']['name']}"
+    selected = []
+
+    for match in matches:
+        match["_time_str"] = event_time(match).strftime("%d/%m-%H.%M")
+
+        # pilih judul
+        teams = match.get("teams")
+        if teams and "home" in teams and "away" in teams:
+            display_title = f"{teams['home']['name']} vs {teams['away']['name']}"
+        else:
+            raw_title = match.get("title", "Unknown Match")
+            if ":" in raw_title:
+                loc, contest = raw_title.split(":", 1)
+                display_title = f"{loc.strip()} {contest.strip()}"
             else:
-                raw_title = match.get("title", "Unknown Match")
-                if ":" in raw_title:
-                    loc, contest = raw_title.split(":", 1)
-                    display_title = f"{loc.strip()} {contest.strip()}"
-                else:
-                    display_title = raw_title
-            
-            # submit task fetch stream
-            for src in match.get("sources", []):
-                source_type = src["source"]
-                source_id = src["id"]
-                fut = executor.submit(fetch_stream, source_type, source_id)
-                tasks[fut] = (match_time_str, display_title, source_type)
-    
+                display_title = raw_title
+        match["_title"] = display_title
+        selected.append(match)
+
+    # urut kickoff supaya output stabil antar run
+    selected.sort(key=lambda m: m["date"])
+
+    with ThreadPoolExecutor(max_workers=15) as executor:
+        results = fetch_streams_for(selected, executor)
+
     # proses hasil fetch
-    for fut in as_completed(tasks):
-        match_time_str, display_title, source_type = tasks[fut]
-        streams = fut.result()
-        if not streams:
-            continue
-        
+    for match, source_type, streams in results:
+        match_time_str, display_title = match["_time_str"], match["_title"]
+
         # Ambil hanya server 1
         stream = streams[0]
         stream_no = stream.get("streamNo", 1)
         if stream_no != 1:
             stream_no = 1  # pastikan server tetap 1
-        
+
         server_name = f"{source_type} server {stream_no}"
         slug = f"{source_type}/{stream['id']}/{stream_no}"
-        
+
         playlist += (
             f'#EXTINF:-1 tvg-logo="{LOGO_URL}" group-title="⚽️| LIVE EVENT",{match_time_str} {display_title} {server_name}\n'
             f"{VLC_OPTS}"
             f"{WORKER_URL.format(slug)}\n\n"
         )
-    
+
     with open("schedule_today.m3u", "w", encoding="utf-8") as f:
         f.write(playlist)
-    
+
     print("✅ schedule_today.m3u berhasil dibuat")
+    snapshot.report()
 
 if __name__ == "__main__":
     main()
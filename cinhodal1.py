@@ -1,15 +1,21 @@
 import asyncio
-import requests
+import http_client
 import json
+import queue
 from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+import websocket  # websocket-client, sudah ikut terpasang bersama selenium
 import time
-import datetime
-from zoneinfo import ZoneInfo
+import ssl
+import threading
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urlparse, unquote
 import base64
+
+from proxy_list import load_proxy_list
+from proxy_reputation import get_reputation
+from sterame3_snapshot import FeedSnapshot, recent_matches
 try:
     from Cryptodome.Cipher import AES
     from Cryptodome.Util import Counter
@@ -30,21 +36,58 @@ STREAM_URL = config_globals.get("STREAM_URL")
 HEADERS = config_globals.get("HEADERS")
 PROXY_LIST_URL = config_globals.get("PROXY_LIST_URL")
 
-EXEMPT_CATEGORIES = ["fight", "motor-sports", "tennis"]
+# match & stream JSON dibagi dengan cinhodal.py lewat snapshot on-disk
+snapshot = FeedSnapshot(MATCHES_URL, STREAM_URL, HEADERS)
+
+# pre-kualifikasi proxy (TCP -> CONNECT -> GET kecil) sebelum dicek pakai Chrome
+PREQUAL_TIMEOUT = 4
+PREQUAL_CONCURRENCY = 100
+PREQUAL_KEEP = 8
+
+# embedsports di-resolve langsung (POST + decrypt), tanpa Chrome
+EMBEDSPORTS_HOST = "embedsports.top"
+EMBEDSPORTS_WORKERS = 8
+
+# Chrome dipakai ulang: tiap worker satu browser, tiap embed satu tab baru
+CHROME_WORKERS = 4
+M3U8_TIMEOUT = 15
+LIMIT_MATCHES = 60
 
 # ---------------- Embedsports decryptor ----------------
 class Embedsports:
+    """Resolve link embedsports tanpa browser. Hasil di-cache per
+    (source, id, streamNo), aman dipanggil dari banyak thread."""
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_embed(embed_url: str) -> bool:
+        return EMBEDSPORTS_HOST in (urlparse(embed_url).hostname or "")
+
+    @staticmethod
+    def parse(embed_url: str):
+        split = urlparse(embed_url).path.strip("/").split("/")
+        return split[-3], split[-2], split[-1]
+
     def get_link(self, embed_url: str) -> str:
-        split = embed_url.strip("/").split("/")
-        stream_sc = split[-3]
-        stream_id = split[-2]
-        stream_no = split[-1]
+        key = self.parse(embed_url)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        link = self._fetch_link(*key)
+        with self._lock:
+            self._cache[key] = link
+        return link
+
+    def _fetch_link(self, stream_sc, stream_id, stream_no) -> str:
         payload = bytes([
             0x0A, len(stream_sc), *stream_sc.encode("utf-8"),
             0x12, len(stream_id), *stream_id.encode("utf-8"),
             0x1A, len(stream_no), *stream_no.encode("utf-8")
         ])
-        fetch = requests.post(
+        fetch = http_client.post(
             "https://embedsports.top/fetch",
             data=payload,
             headers={"Content-Type": "application/octet-stream"},
@@ -64,34 +107,25 @@ class Embedsports:
 
 # ---------------- Utils -----------------
 def load_proxies():
-    try:
-        resp = requests.get(PROXY_LIST_URL, timeout=15)
-        resp.raise_for_status()
-        proxies = [line.strip() for line in resp.text.splitlines() if line.strip()]
-        print(f"🔌 Total proxy terambil: {len(proxies)}")
-        return proxies
-    except Exception as e:
-        print(f"⚠️ Gagal ambil proxy list: {e}")
-        return []
+    return load_proxy_list(PROXY_LIST_URL)
 
 
 def fetch_stream(source_type, source_id):
     try:
-        url = STREAM_URL.format(source_type, source_id)
-        res = requests.get(url, headers=HEADERS, timeout=30)
-        res.raise_for_status()
-        return res.json()
+        return snapshot.streams(source_type, source_id, timeout=30)
     except Exception as e:
         print(f"⚠️ gagal fetch stream {source_type}/{source_id}: {e}")
         return []
 
 
-def extract_m3u8(embed_url, wait_time=15, proxy=None):
+def chrome_options_for(proxy=None):
     chrome_options = Options()
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--headless=new")
+    # jangan tunggu halaman selesai load, m3u8 dipantau dari event network
+    chrome_options.page_load_strategy = "none"
 
     if proxy:
         if proxy.startswith("http") or proxy.startswith("socks"):
@@ -103,63 +137,264 @@ def extract_m3u8(embed_url, wait_time=15, proxy=None):
     chrome_options.add_argument("--disable-webrtc")
     chrome_options.add_argument("--disable-features=WebRtcHideLocalIpsWithMdns")
     chrome_options.add_argument("--force-webrtc-ip-handling-policy=disable_non_proxied_udp")
-    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
 
-    driver = webdriver.Chrome(options=chrome_options)
-    m3u8_url = None
-    try:
-        print(f"\n🌐 buka {embed_url}")
-        driver.get(embed_url)
-        time.sleep(wait_time)
-        logs = driver.get_log("performance")
-        for entry in logs:
+
+class ChromeWorker:
+    """Satu Chrome yang hidup lama. Tiap embed dibuka di tab baru; worker
+    tersambung langsung ke websocket DevTools tab itu dan menunggu event CDP
+    Network.requestWillBeSent (termasuk dari iframe lewat auto-attach),
+    begitu ada request .m3u8 langsung selesai."""
+
+    def __init__(self, proxy=None):
+        self.driver = webdriver.Chrome(options=chrome_options_for(proxy))
+        self.home = self.driver.current_window_handle
+        self.debugger_address = self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+
+    def _tab_ws_url(self, handle):
+        # window handle chromedriver = target id CDP
+        targets = http_client.get(f"http://{self.debugger_address}/json", timeout=5).json()
+        for target in targets:
+            if target.get("id") == handle:
+                return target["webSocketDebuggerUrl"]
+        raise RuntimeError(f"target CDP untuk tab {handle} tidak ditemukan")
+
+    @staticmethod
+    def _wait_m3u8(ws, embed_url, timeout):
+        ids = iter(range(1, 1_000_000))
+
+        def send(method, params=None, session_id=None):
+            message = {"id": next(ids), "method": method, "params": params or {}}
+            if session_id:
+                message["sessionId"] = session_id
+            ws.send(json.dumps(message))
+
+        auto_attach = {"autoAttach": True, "waitForDebuggerOnStart": True, "flatten": True}
+        send("Network.enable")
+        send("Target.setAutoAttach", auto_attach)
+        send("Page.navigate", {"url": embed_url})
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ws.settimeout(remaining)
             try:
-                msg = json.loads(entry["message"])
-                params = msg.get("message", {}).get("params", {})
-                url = params.get("request", {}).get("url", "")
-                if ".m3u8" in url:
-                    print(f"🎯 ketemu m3u8: {url}")
-                    m3u8_url = url
-                    break
-            except Exception:
+                message = ws.recv()
+            except websocket.WebSocketTimeoutException:
+                return None
+
+            # iframe lintas-situs jalan di target sendiri: aktifkan Network di sana juga
+            if "Target.attachedToTarget" in message:
+                event = json.loads(message)
+                if event.get("method") == "Target.attachedToTarget":
+                    session_id = event["params"]["sessionId"]
+                    send("Network.enable", session_id=session_id)
+                    send("Target.setAutoAttach", auto_attach, session_id=session_id)
+                    send("Runtime.runIfWaitingForDebugger", session_id=session_id)
+                continue
+
+            # saring murah dulu sebelum decode JSON
+            if ".m3u8" not in message or "Network.requestWillBeSent" not in message:
                 continue
+            event = json.loads(message)
+            if event.get("method") != "Network.requestWillBeSent":
+                continue
+            url = event.get("params", {}).get("request", {}).get("url", "")
+            if ".m3u8" in url:
+                return url
+
+    def extract(self, embed_url, timeout=M3U8_TIMEOUT):
+        driver = self.driver
+        driver.switch_to.new_window("tab")
+        ws = None
+        try:
+            ws = websocket.create_connection(
+                self._tab_ws_url(driver.current_window_handle),
+                timeout=timeout,
+                suppress_origin=True
+            )
+            print(f"\n🌐 buka {embed_url}")
+            url = self._wait_m3u8(ws, embed_url, timeout)
+            if url:
+                print(f"🎯 ketemu m3u8: {url}")
+            return url
+        finally:
+            if ws:
+                ws.close()
+            driver.close()
+            driver.switch_to.window(self.home)
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class ChromePool:
+    """Pool ChromeWorker (maksimal `size`), dibuat saat dibutuhkan.
+    Worker yang error diganti baru; panggil close() di akhir."""
+
+    def __init__(self, size=CHROME_WORKERS, proxy=None):
+        self.proxy = proxy
+        self._slots = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        # None = slot kosong, Chrome baru distart saat slot itu dipakai
+        for _ in range(size):
+            self._slots.put(None)
+
+    def _acquire(self):
+        worker = self._slots.get()
+        if worker is not None:
+            return worker
+        try:
+            worker = ChromeWorker(self.proxy)
+        except Exception:
+            self._slots.put(None)
+            raise
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def extract(self, embed_url, timeout=M3U8_TIMEOUT):
+        worker = self._acquire()
+        healthy = False
+        try:
+            url = worker.extract(embed_url, timeout)
+            healthy = True
+            return url
+        except Exception as e:
+            # termasuk error urllib3 kalau chromedriver mati, bukan cuma WebDriverException
+            print(f"⚠️ Chrome worker error, diganti: {getattr(e, 'msg', None) or e}")
+            return None
+        finally:
+            if healthy:
+                self._slots.put(worker)
+            else:
+                worker.quit()
+                with self._lock:
+                    if worker in self._workers:
+                        self._workers.remove(worker)
+                self._slots.put(None)
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.quit()
+
+
+def extract_m3u8(embed_url, wait_time=M3U8_TIMEOUT, proxy=None):
+    worker = ChromeWorker(proxy)
+    try:
+        return worker.extract(embed_url, wait_time)
     finally:
-        driver.quit()
-    return m3u8_url
+        worker.quit()
+
+
+async def _read_head(reader, timeout):
+    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+    status_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+    parts = status_line.split()
+    if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+        raise ValueError(f"respon aneh: {status_line!r}")
+    return int(parts[1])
+
+
+async def prequalify_proxy(proxy, host, port=443, timeout=PREQUAL_TIMEOUT):
+    """Cek murah satu proxy: TCP connect, tunnel CONNECT ke host embed, lalu
+    GET kecil lewat TLS. Hasil: latency (detik), error kalau gagal.
+
+    Proxy socks hanya dicek sampai TCP connect.
+    """
+    parsed = urlparse(proxy if "://" in proxy else f"http://{proxy}")
+    start = time.monotonic()
+
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(parsed.hostname, parsed.port or 8080), timeout
+    )
+    try:
+        if not parsed.scheme.startswith("http"):
+            return time.monotonic() - start
+
+        auth = ""
+        if parsed.username:
+            cred = f"{unquote(parsed.username)}:{unquote(parsed.password or '')}"
+            auth = f"Proxy-Authorization: Basic {base64.b64encode(cred.encode()).decode()}\r\n"
+        writer.write(
+            f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n{auth}\r\n".encode()
+        )
+        await writer.drain()
+        status = await _read_head(reader, timeout)
+        if status != 200:
+            raise ConnectionError(f"CONNECT {status}")
+
+        await asyncio.wait_for(
+            writer.start_tls(ssl.create_default_context(), server_hostname=host), timeout
+        )
+        writer.write(
+            f"GET / HTTP/1.1\r\nHost: {host}\r\nUser-Agent: Mozilla/5.0\r\n"
+            "Range: bytes=0-0\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status = await _read_head(reader, timeout)
+        if status >= 500:
+            raise ConnectionError(f"GET {status}")
+        return time.monotonic() - start
+    finally:
+        writer.close()
+
+
+async def prequalify_proxies(embed_url, proxies, keep=PREQUAL_KEEP):
+    """Pre-kualifikasi semua proxy bersamaan, kembalikan yang lolos urut tercepat."""
+    host = urlparse(embed_url).hostname
+    reputation = get_reputation()
+    semaphore = asyncio.Semaphore(PREQUAL_CONCURRENCY)
+    print(f"🩺 Pre-kualifikasi {len(proxies)} proxy ke {host} ...")
+
+    async def check(proxy):
+        async with semaphore:
+            try:
+                elapsed = await prequalify_proxy(proxy, host)
+            except Exception:
+                reputation.record(proxy, False)
+                return None
+            reputation.record(proxy, True, elapsed)
+            return elapsed, proxy
+
+    results = await asyncio.gather(*(check(p) for p in proxies))
+    passed = [p for _, p in sorted(r for r in results if r)]
+    print(f"✅ Lolos pre-kualifikasi: {len(passed)} proxy, dicek Chrome: {min(len(passed), keep)}")
+    return passed[:keep]
 
 
 def find_working_proxy(embed_url, proxies):
+    reputation = get_reputation()
     for proxy in proxies:
         print(f"🔎 coba proxy {proxy}")
+        start = time.monotonic()
         try:
             url = extract_m3u8(embed_url, wait_time=10, proxy=proxy)
             if url:
                 print(f"✅ Proxy OK: {proxy}")
+                reputation.record(proxy, True, time.monotonic() - start)
                 return proxy
         except Exception as e:
             print(f"❌ proxy {proxy} error: {e}")
+        reputation.record(proxy, False)
     print("⚠️ Tidak ada proxy yang berhasil")
     return None
 
 # ---------------- Main Logic -----------------
-async def main(limit_matches=20, apply_time_filter=True):
-    res = requests.get(MATCHES_URL, headers=HEADERS, timeout=15)
-    matches = res.json()
-    now = datetime.datetime.now(ZoneInfo("Asia/Jakarta"))
-
-    filtered_matches = []
-    for match in matches:
-        start_at = match["date"] / 1000
-        event_time_utc = datetime.datetime.fromtimestamp(start_at, ZoneInfo("UTC"))
-        event_time_local = event_time_utc.astimezone(ZoneInfo("Asia/Jakarta"))
-        category = match.get("category", "").lower()
-        if apply_time_filter and category not in EXEMPT_CATEGORIES:
-            if event_time_local < (now - datetime.timedelta(hours=2)):
-                continue
-        filtered_matches.append(match)
+async def main(limit_matches=LIMIT_MATCHES, apply_time_filter=True):
+    filtered_matches = recent_matches(snapshot.matches(timeout=15), apply_time_filter)
 
     print(f"📊 Total match terpilih: {len(filtered_matches)}")
-    results, embed_tasks = {}, {}
+    results, embed_tasks, embedsports_tasks = {}, {}, {}
+    es = Embedsports()
 
     with ThreadPoolExecutor(max_workers=10) as executor:
         loop = asyncio.get_running_loop()
@@ -186,41 +421,59 @@ async def main(limit_matches=20, apply_time_filter=True):
             print(f"[+] API {key} → {url}")
         else:
             embed = stream.get("embedUrl")
-            if embed:
+            if embed and es.is_embed(embed):
+                embedsports_tasks[key] = embed
+            elif embed:
                 embed_tasks[key] = embed
 
+    if embedsports_tasks:
+        print(f"🔓 Decrypt {len(embedsports_tasks)} embedsports tanpa browser")
+        with ThreadPoolExecutor(max_workers=EMBEDSPORTS_WORKERS) as executor:
+            loop = asyncio.get_running_loop()
+            tasks = [
+                loop.run_in_executor(executor, es.get_link, embed_url)
+                for embed_url in embedsports_tasks.values()
+            ]
+            links = await asyncio.gather(*tasks, return_exceptions=True)
+
+        for key, url in zip(embedsports_tasks.keys(), links):
+            if isinstance(url, Exception) or not url:
+                print(f"⚠️ Gagal decrypt {key}: {url}")
+                continue
+            results[key] = url
+            print(f"🔓 Decrypt {key} → {url}")
+
     proxies = load_proxies()
     working_proxy = None
     if embed_tasks and proxies:
         test_url = list(embed_tasks.values())[0]
-        working_proxy = find_working_proxy(test_url, proxies)
+        candidates = await prequalify_proxies(test_url, get_reputation().rank(proxies))
+        working_proxy = find_working_proxy(test_url, candidates)
 
     if working_proxy:
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            loop = asyncio.get_running_loop()
-            tasks = [
-                loop.run_in_executor(executor, extract_m3u8, embed_url, 15, working_proxy)
-                for embed_url in embed_tasks.values()
-            ]
-            results_list = await asyncio.gather(*tasks)
+        chrome_pool = ChromePool(CHROME_WORKERS, working_proxy)
+        try:
+            with ThreadPoolExecutor(max_workers=CHROME_WORKERS) as executor:
+                loop = asyncio.get_running_loop()
+                tasks = [
+                    loop.run_in_executor(executor, chrome_pool.extract, embed_url)
+                    for embed_url in embed_tasks.values()
+                ]
+                results_list = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            chrome_pool.close()
 
-        es = Embedsports()
-        for key, (embed_url, url) in zip(embed_tasks.keys(), zip(embed_tasks.values(), results_list)):
-            if url:
-                host = urlparse(embed_url).hostname or ""
-                if "embedsports.top" in host:
-                    try:
-                        url = es.get_link(embed_url)
-                        print(f"🔓 Decrypt {key} → {url}")
-                    except Exception as e:
-                        print(f"⚠️ Gagal decrypt {key}: {e}")
-                        continue
+        for key, url in zip(embed_tasks.keys(), results_list):
+            if isinstance(url, Exception):
+                print(f"⚠️ Gagal buka embed {key}: {url}")
+            elif url:
                 results[key] = url
                 print(f"[+] Embed {key} → {url}")
 
     with open("map5.json", "w", encoding="utf-8") as f:
         json.dump(results, f, indent=2, ensure_ascii=False)
     print(f"\n✅ Disimpan {len(results)} stream ke map5.json")
+    snapshot.report()
 
 
 if __name__ == "__main__":
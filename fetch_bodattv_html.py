@@ -1,6 +1,6 @@
 import asyncio
 from pathlib import Path
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
 # =======================
 # 🔧 KONFIGURASI
@@ -44,54 +44,110 @@ EXTRA_HEADERS = {
 # =======================
 # 🔧 UTILITAS
 # =======================
-async def scroll_page(page):
-    previous_height = None
-    while True:
-        current_height = await page.evaluate("document.body.scrollHeight")
-        if previous_height == current_height:
+# slug match diambil langsung dari DOM (sama seperti extract_slug di generate_map_bodattv)
+SLUGS_JS = """
+() => Array.from(document.querySelectorAll("div.common-table-row.table-row")).map(row => {
+    const onclick = row.getAttribute("onclick");
+    if (onclick) {
+        const m = onclick.match(/\\/match\\/([^"']+)/);
+        if (m) return m[1].trim();
+    }
+    const link = row.querySelector("a[href^='/match/']");
+    return link ? link.getAttribute("href").replace("/match/", "").trim() : null;
+}).filter(Boolean)
+"""
+
+async def collect_slugs(page):
+    return await page.evaluate(SLUGS_JS)
+
+# scroll berhenti kalau jumlah baris tidak bertambah selama SCROLL_QUIET_MS,
+# atau sudah mencapai batas langkah / batas baris
+ROW_SELECTOR = ".common-table-row, .slide-item"
+SCROLL_QUIET_MS = 1500
+SCROLL_MAX_STEPS = 50
+SCROLL_MAX_ROWS = 1000
+
+# MutationObserver di halaman yang menyimpan jumlah baris terbaru di window.__bodattvRows
+ROW_OBSERVER_JS = """
+(selector) => {
+    const count = () => document.querySelectorAll(selector).length;
+    window.__bodattvRows = count();
+    if (!window.__bodattvObserver) {
+        window.__bodattvObserver = new MutationObserver(() => { window.__bodattvRows = count(); });
+        window.__bodattvObserver.observe(document.body, { childList: true, subtree: true });
+    }
+    return window.__bodattvRows;
+}
+"""
+
+async def scroll_page(page, on_step=None):
+    """Scroll ke bawah selama baris baru masih muncul (dipantau MutationObserver).
+    `on_step(page)` (async) hanya dipanggil kalau ada baris baru, misalnya
+    untuk ambil slug baru."""
+    rows = await page.evaluate(ROW_OBSERVER_JS, ROW_SELECTOR)
+
+    for _ in range(SCROLL_MAX_STEPS):
+        if rows >= SCROLL_MAX_ROWS:
+            print(f"⚠️ Batas {SCROLL_MAX_ROWS} baris tercapai, berhenti scroll.")
             break
+
         await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(2000)
-        previous_height = current_height
+        try:
+            await page.wait_for_function(
+                "(n) => window.__bodattvRows > n", arg=rows, timeout=SCROLL_QUIET_MS
+            )
+        except PlaywrightTimeoutError:
+            break
+
+        rows = await page.evaluate("window.__bodattvRows")
+        if on_step:
+            await on_step(page)
+
+    print(f"📜 Selesai scroll: {rows} baris")
 
 # =======================
 # 🔧 SCRAPER DENGAN COOKIE CF_CLEARANCE + EXTRA HEADERS
 # =======================
+async def open_page(p):
+    """Launch browser + cookie cf_clearance + EXTRA_HEADERS, lalu buka DEFAULT_URL.
+    Hasil: (browser, page); browser wajib ditutup pemanggil."""
+    print(f"🌐 Membuka halaman: {DEFAULT_URL}")
+    browser = await p.chromium.launch(headless=True)
+
+    context = await browser.new_context(
+        user_agent=USER_AGENT,
+        viewport={"width": 1366, "height": 768}
+    )
+
+    # Inject cookie cf_clearance
+    await context.add_cookies([
+        {
+            "name": "cf_clearance",
+            "value": CF_CLEARANCE,
+            "domain": ".fstv.space",
+            "path": "/"
+        }
+    ])
+
+    # Inject EXTRA_HEADERS ke setiap request
+    await context.route("**/*",
+        lambda route, request: route.continue_(headers={
+            **request.headers,
+            **EXTRA_HEADERS
+        })
+    )
+
+    page = await context.new_page()
+
+    # Load halaman
+    await page.goto(DEFAULT_URL, timeout=60000)
+    await page.wait_for_load_state("networkidle")
+    return browser, page
+
 async def fetch_dynamic_html_playwright():
     async with async_playwright() as p:
-        print(f"🌐 Membuka halaman: {DEFAULT_URL}")
-
         try:
-            browser = await p.chromium.launch(headless=True)
-
-            context = await browser.new_context(
-                user_agent=USER_AGENT,
-                viewport={"width": 1366, "height": 768}
-            )
-
-            # Inject cookie cf_clearance
-            await context.add_cookies([
-                {
-                    "name": "cf_clearance",
-                    "value": CF_CLEARANCE,
-                    "domain": ".fstv.space",
-                    "path": "/"
-                }
-            ])
-
-            # Inject EXTRA_HEADERS ke setiap request
-            await context.route("**/*", 
-                lambda route, request: route.continue_(headers={
-                    **request.headers,
-                    **EXTRA_HEADERS
-                })
-            )
-
-            page = await context.new_page()
-
-            # Load halaman
-            await page.goto(DEFAULT_URL, timeout=60000)
-            await page.wait_for_load_state("networkidle")
+            browser, page = await open_page(p)
 
             print("📜 Scrolling halaman...")
             await scroll_page(page)
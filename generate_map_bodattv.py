@@ -2,7 +2,9 @@ import asyncio
 import json
 import time
 import random
+import threading
 import cloudscraper
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from urllib.parse import unquote, urljoin
 from pathlib import Path
@@ -31,16 +33,45 @@ HEADLESS = config.get("HEADLESS", "true").lower() != "false"
 
 OUTPUT_FILE = MAP_FILE
 
+# jumlah halaman /match/<slug> yang di-fetch bersamaan
+RESOLVE_WORKERS = int(config.get("RESOLVE_WORKERS", 6))
+
+# ==========================
+# Session cloudscraper bersama
+# ==========================
+_scraper = None
+_scraper_lock = threading.Lock()
+# sampai ada respon 200 pertama, request dijalankan satu per satu supaya
+# challenge Cloudflare cukup diselesaikan sekali lalu cookie-nya dipakai semua worker
+_warm_lock = threading.Lock()
+_warmed = threading.Event()
+
+def get_scraper():
+    global _scraper
+    with _scraper_lock:
+        if _scraper is None:
+            _scraper = cloudscraper.create_scraper(browser={"custom": USER_AGENT})
+    return _scraper
+
+def scraper_get(url, headers, timeout):
+    scraper = get_scraper()
+    if _warmed.is_set():
+        return scraper.get(url, headers=headers, timeout=timeout)
+    with _warm_lock:
+        r = scraper.get(url, headers=headers, timeout=timeout)
+        if r.status_code == 200:
+            _warmed.set()
+        return r
+
 # ==========================
 # Ambil HTML dengan retry
 # ==========================
 def fetch_html(url, max_retries=3):
-    scraper = cloudscraper.create_scraper(browser={"custom": USER_AGENT})
     headers = {"User-Agent": USER_AGENT}
 
     for attempt in range(1, max_retries + 1):
         try:
-            r = scraper.get(url, headers=headers, timeout=20)
+            r = scraper_get(url, headers, 20)
             if r.status_code == 200 and "<html" in r.text.lower():
                 print(f"✅ [OK] HTML loaded ({url})")
                 return r.text
@@ -66,7 +97,9 @@ def extract_m3u8_from_html(html, base_url):
         print("❌ Tidak ada iframe ditemukan.")
         return []
 
-    src = iframe["src"]
+    return extract_m3u8_from_iframe(iframe["src"], base_url)
+
+def extract_m3u8_from_iframe(src, base_url):
     iframe_url = urljoin(base_url, src)
     print(f"🔗 iframe src: {iframe_url}")
 
@@ -98,6 +131,22 @@ def extract_slugs_from_html(html):
     matches = soup.select("div.common-table-row.table-row")
     return [extract_slug(row) for row in matches if extract_slug(row)]
 
+# ==========================
+# Resolve & simpan
+# ==========================
+def resolve_slug(slug):
+    url = f"{BASE_URL}/match/{slug}"
+    page_html = fetch_html(url)
+    m3u8_links = extract_m3u8_from_html(page_html, url)
+    return m3u8_links[0] if m3u8_links else None
+
+def save_map(data, path=OUTPUT_FILE):
+    # tulis ke file sementara dulu supaya map2.json tidak pernah setengah jadi
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp.replace(path)
+
 # ==========================
 # Main logic
 # ==========================
@@ -113,8 +162,7 @@ async def main():
         print("📺 Mode: halaman pertandingan tunggal")
         m3u8_links = extract_m3u8_from_html(html, BASE_URL)
         data = {"single_match": m3u8_links[0] if m3u8_links else None}
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        save_map(data)
         print(f"💾 Disimpan ke {OUTPUT_FILE}")
 
     # halaman daftar
@@ -124,18 +172,19 @@ async def main():
         print(f"🔍 Total slug ditemukan: {len(slugs)}")
         map_data = {}
 
-        for slug in slugs:
-            url = f"{BASE_URL}/match/{slug}"
+        def safe_resolve(slug):
             try:
-                page_html = fetch_html(url)
-                m3u8_links = extract_m3u8_from_html(page_html, url)
-                if m3u8_links:
-                    map_data[slug] = m3u8_links[0]
+                return resolve_slug(slug)
             except Exception as e:
                 print(f"⚠️ Gagal proses slug {slug}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS) as executor:
+            for slug, link in zip(slugs, executor.map(safe_resolve, slugs)):
+                if link:
+                    map_data[slug] = link
 
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(map_data, f, indent=2, ensure_ascii=False)
+        save_map(map_data)
         print(f"💾 Disimpan ke {OUTPUT_FILE}")
 
 # ==========================
@@ -0,0 +1,101 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# ==========================
+# KONFIGURASI
+# ==========================
+GLOSSARY_DIR = Path(__file__).parent / "glossary"
+
+_END = object()
+
+
+# ==========================
+# Glossary
+# ==========================
+class Glossary:
+    """Kamus nama tim/liga yang dikompilasi jadi trie, sekali bangun.
+
+    Pencocokan satu kali jalan dari kiri ke kanan, selalu ambil key
+    terpanjang (tidak tergantung urutan entry) dan tidak peka huruf besar.
+    Dengan `word_boundary=True` (bahasa berspasi seperti Vietnam) key hanya
+    cocok di batas kata, jadi "Anh" tidak memakan "Thanh".
+    """
+
+    def __init__(self, entries, word_boundary=True):
+        self.word_boundary = word_boundary
+        self._root = {}
+        for key, value in entries.items():
+            key = key.strip().lower()
+            if not key:
+                continue
+            node = self._root
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_END] = value
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def _is_boundary(self, text, i):
+        if not self.word_boundary:
+            return True
+        return i <= 0 or i >= len(text) or not text[i].isalnum() or not text[i - 1].isalnum()
+
+    def _longest(self, text, folded, start):
+        if self.word_boundary and start > 0 and folded[start - 1].isalnum():
+            return None, None
+
+        node, best, best_end = self._root, None, None
+        for j in range(start, len(folded)):
+            node = node.get(folded[j])
+            if node is None:
+                break
+            if _END in node and self._is_boundary(text, j + 1):
+                best, best_end = node[_END], j + 1
+        return best, best_end
+
+    def apply(self, text):
+        """Ganti semua key yang cocok. Hasil: (teks, seluruh teks tercakup?)."""
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = text
+
+        pieces, covered, i = [], True, 0
+        while i < len(text):
+            value, end = self._longest(text, folded, i)
+            if end is not None:
+                pieces.append(f" {value} " if not self.word_boundary else value)
+                i = end
+                continue
+
+            ch = text[i]
+            if not (ch.isspace() or ch.isascii()):
+                covered = False
+            pieces.append(ch)
+            i += 1
+
+        result = re.sub(r"\s{2,}", " ", "".join(pieces)).strip()
+        return result, covered
+
+    def replace(self, text):
+        return self.apply(text)[0]
+
+    def translate(self, text):
+        """Terjemahan offline kalau seluruh teks tercakup glossary, selain itu None."""
+        if not text:
+            return None
+        result, covered = self.apply(text)
+        return result if covered and result else None
+
+
+@lru_cache(maxsize=None)
+def load_glossary(name, word_boundary=True):
+    """Muat glossary/<name>.json sekali per proses, kosong kalau file tidak ada."""
+    path = GLOSSARY_DIR / f"{name}.json"
+    if not path.exists():
+        return Glossary({}, word_boundary=word_boundary)
+    return Glossary.from_file(path, word_boundary=word_boundary)
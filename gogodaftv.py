@@ -1,12 +1,15 @@
 import asyncio
+import codecs
+import re
 
 from bs4 import BeautifulSoup
 from datetime import datetime, timezone, timedelta
-from deep_translator import GoogleTranslator
 from pathlib import Path
 
 from curl_cffi import requests
 
+from batch_translate import translate_many_async
+
 
 # ==========================
 # Timezone
@@ -82,141 +85,200 @@ translation_cache = {}
 
 
 # ==========================
-# Translate
+# Decode HTML
 # ==========================
-async def translate_zh_to_en(text):
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except Exception:
+    detect_charset = None
+
+CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_\-]+)""",
+    re.I
+)
+
+# gb2312 / gbk dibaca sebagai gb18030 (superset) supaya karakter langka aman
+CHARSET_ALIASES = {
+    "gb2312": "gb18030",
+    "gbk": "gb18030",
+    "x-gbk": "gb18030",
+    "utf8": "utf-8",
+}
 
-    if not text:
-        return ""
+BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
 
-    text = text.strip()
 
-    if text in translation_cache:
-        return translation_cache[text]
+def normalize_charset(name):
+
+    if not name:
+        return None
+
+    name = name.strip().strip("\"'").lower()
+    name = CHARSET_ALIASES.get(name, name)
 
     try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
 
-        translated = GoogleTranslator(
-            source="zh-CN",
-            target="en"
-        ).translate(text)
 
-        if translated:
-            translation_cache[text] = translated
+def sniff_charset(raw, content_type=None):
 
-            await asyncio.sleep(0.15)
+    for bom, enc in BOMS:
 
-            return translated
+        if raw.startswith(bom):
+            return enc, "BOM"
 
-    except Exception as e:
+    if content_type:
 
-        print(f"Translate error for '{text}': {e}")
+        m = re.search(
+            r"charset\s*=\s*([^;\s]+)",
+            content_type,
+            re.I
+        )
 
-    return text
+        enc = normalize_charset(m.group(1)) if m else None
 
+        if enc:
+            return enc, "Content-Type"
 
-# ==========================
-# Decode HTML
-# ==========================
-def decode_html(raw):
+    m = CHARSET_RE.search(raw[:4096])
 
-    encodings = [
-        "utf-8",
-        "gb18030",
-        "gbk",
-        "gb2312",
-        "big5"
-    ]
+    enc = normalize_charset(m.group(1).decode("ascii", "ignore")) if m else None
 
-    for enc in encodings:
+    if enc:
+        return enc, "meta"
 
-        try:
+    return None, None
+
+
+def decode_html(raw, content_type=None):
+
+    if not raw:
+        return ""
+
+    enc, source = sniff_charset(raw, content_type)
 
-            decoded = raw.decode(enc)
+    # satu kali deteksi statistik kalau header/meta/BOM tidak ada
+    if not enc and detect_charset:
 
-            # validasi chinese
-            if any(
-                x in decoded
-                for x in [
-                    "直播",
-                    "足球",
-                    "联赛",
-                    "女",
-                    "队",
-                    "VS"
-                ]
-            ):
+        try:
 
-                print(f"✅ Decoded with: {enc}")
+            best = detect_charset(raw).best()
 
-                return decoded
+            if best:
+                enc = normalize_charset(best.encoding)
+                source = "detect"
 
         except Exception:
             pass
 
-    # fallback terakhir
-    try:
-        return raw.decode(
-            "utf-8",
-            errors="ignore"
-        )
+    if not enc:
 
-    except Exception:
-        return ""
+        enc, source = "utf-8", "default"
+
+    print(f"✅ Decoded with: {enc} ({source})")
+
+    return raw.decode(
+        enc,
+        errors="replace"
+    )
 
 
 # ==========================
 # Fetch HTML
 # ==========================
+async def fetch_variant(session, test_url):
+
+    print(f"\nTrying: {test_url}")
+
+    response = await session.get(
+        test_url,
+        headers=HEADERS,
+        impersonate="chrome136",
+        timeout=30,
+        verify=False,
+        allow_redirects=True,
+        http_version=1
+    )
+
+    print(f"HTTP Status: {response.status_code} ({test_url})")
+    print(f"Final URL: {response.url}")
+
+    raw = response.content
+
+    text = decode_html(
+        raw,
+        response.headers.get("content-type")
+    )
+
+    print("\n===== HTML PREVIEW =====")
+    print(text[:500])
+    print("========================\n")
+
+    if (
+        response.status_code == 200
+        and len(text) > 5000
+    ):
+
+        print(f"✅ Success: {test_url}")
+
+        return text
+
+    print(f"⚠️ Invalid response: {test_url}")
+
+    return ""
+
+
 async def fetch_html(url):
 
-    test_urls = [
+    test_urls = list(dict.fromkeys([
         url,
         url.replace("https://", "http://"),
         url.replace("www.", ""),
-    ]
+    ]))
 
-    for test_url in test_urls:
-
-        try:
+    # semua varian URL dijalankan bersamaan,
+    # ambil respon valid pertama lalu batalkan sisanya
+    async with requests.AsyncSession() as session:
 
-            print(f"\nTrying: {test_url}")
-
-            response = requests.get(
-                test_url,
-                headers=HEADERS,
-                impersonate="chrome136",
-                timeout=30,
-                verify=False,
-                allow_redirects=True,
-                http_version=1
+        tasks = [
+            asyncio.create_task(
+                fetch_variant(session, test_url)
             )
+            for test_url in test_urls
+        ]
 
-            print(f"HTTP Status: {response.status_code}")
-            print(f"Final URL: {response.url}")
+        try:
 
-            raw = response.content
+            for fut in asyncio.as_completed(tasks):
 
-            text = decode_html(raw)
+                try:
 
-            print("\n===== HTML PREVIEW =====")
-            print(text[:500])
-            print("========================\n")
+                    text = await fut
 
-            if (
-                response.status_code == 200
-                and len(text) > 5000
-            ):
+                except Exception as e:
 
-                print("✅ Success")
+                    print(f"Fetch error: {e}")
 
-                return text
+                    continue
 
-            print("⚠️ Invalid response")
+                if text:
+                    return text
 
-        except Exception as e:
+        finally:
 
-            print(f"Fetch error: {e}")
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(
+                *tasks,
+                return_exceptions=True
+            )
 
     return ""
 
@@ -248,6 +310,8 @@ async def parse_matches(html):
 
     parsed_ids = set()
 
+    parsed = []
+
     for a_tag in a_tags:
 
         try:
@@ -352,21 +416,6 @@ async def parse_matches(html):
                 f"{away_team} ({liga_name})"
             )
 
-            # ==========================
-            # TRANSLATE
-            # ==========================
-            home_team_en = await translate_zh_to_en(
-                home_team
-            )
-
-            away_team_en = await translate_zh_to_en(
-                away_team
-            )
-
-            liga_name_en = await translate_zh_to_en(
-                liga_name
-            )
-
             # ==========================
             # TIME
             # ==========================
@@ -407,6 +456,60 @@ async def parse_matches(html):
                     f"{data_time} {event_time}"
                 )
 
+            parsed.append({
+                "match_id": match_id,
+                "home_team": home_team,
+                "away_team": away_team,
+                "liga_name": liga_name,
+                "dt_str": dt_str,
+            })
+
+        except Exception as e:
+
+            print(f"Parse match error: {e}")
+
+            continue
+
+    # ==========================
+    # TRANSLATE (batch, sekali jalan)
+    # ==========================
+    translated = await translate_many_async(
+        [
+            text
+            for match in parsed
+            for text in (
+                match["home_team"],
+                match["away_team"],
+                match["liga_name"],
+            )
+        ],
+        source="zh-CN",
+        target="en",
+        cache=translation_cache
+    )
+
+    for match in parsed:
+
+        try:
+
+            match_id = match["match_id"]
+            dt_str = match["dt_str"]
+
+            home_team_en = translated.get(
+                match["home_team"].strip(),
+                match["home_team"]
+            )
+
+            away_team_en = translated.get(
+                match["away_team"].strip(),
+                match["away_team"]
+            )
+
+            liga_name_en = translated.get(
+                match["liga_name"].strip(),
+                match["liga_name"]
+            )
+
             # ==========================
             # TITLE
             # ==========================
@@ -447,7 +550,7 @@ async def parse_matches(html):
 
         except Exception as e:
 
-            print(f"Parse match error: {e}")
+            print(f"Build match error: {e}")
 
             continue
 
@@ -459,19 +562,9 @@ async def parse_matches(html):
 # ==========================
 async def main():
 
-    html = ""
-
-    # retry fetch
-    for i in range(3):
-
-        print(f"\nRetry {i+1}/3")
-
-        html = await fetch_html(TARGET_URL)
-
-        if html:
-            break
-
-        await asyncio.sleep(5)
+    # varian URL sudah di-race di fetch_html, jadi tidak perlu retry luar:
+    # waktu terburuk cukup satu timeout per varian (30 detik)
+    html = await fetch_html(TARGET_URL)
 
     if not html:
 
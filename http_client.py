@@ -0,0 +1,93 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except Exception:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (dipakai httpx untuk HTTP/2)
+    H2_AVAILABLE = True
+except Exception:
+    H2_AVAILABLE = False
+
+# ==========================
+# KONFIGURASI
+# ==========================
+# timeout default (connect, read) kalau pemanggil tidak memberi timeout
+DEFAULT_TIMEOUT = (5, 20)
+
+# jumlah host yang pool-nya disimpan, dan koneksi keep-alive per host
+POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", 20))
+POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 32))
+
+# HTTP/2 hanya untuk client async, dan hanya kalau paket h2 terpasang
+HTTP2 = os.environ.get("HTTP_CLIENT_HTTP2", "1") != "0" and H2_AVAILABLE
+
+
+# ==========================
+# Sync (requests)
+# ==========================
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Session requests bersama per proses: pool per host + keep-alive.
+
+    Aman dipakai dari ThreadPoolExecutor; pool_maxsize dibuat cukup besar
+    supaya worker paralel ke host yang sama tidak membuka koneksi baru.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=POOL_CONNECTIONS,
+                pool_maxsize=POOL_MAXSIZE,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+def request(method, url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+# ==========================
+# Async (httpx)
+# ==========================
+def async_client(**kwargs):
+    """AsyncClient httpx dengan batas pool, keep-alive dan HTTP/2 opsional.
+
+    Dipakai sebagai `async with http_client.async_client() as client:`.
+    """
+    if httpx is None:
+        raise RuntimeError("httpx belum terpasang (pip install httpx[http2])")
+
+    connect, read = DEFAULT_TIMEOUT
+    options = {
+        "http2": HTTP2,
+        "timeout": httpx.Timeout(read, connect=connect),
+        "limits": httpx.Limits(
+            max_connections=POOL_MAXSIZE * 2,
+            max_keepalive_connections=POOL_MAXSIZE,
+        ),
+        "follow_redirects": True,
+    }
+    options.update(kwargs)
+    return httpx.AsyncClient(**options)
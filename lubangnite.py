@@ -1,12 +1,14 @@
 import os
 import json
-import requests
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from urllib.parse import unquote, urlparse, parse_qs, quote
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 
+import http_client
+from stream_expiry import plan_refresh
+
 # ==============================
 # Konfigurasi Awal
 # ==============================
@@ -29,6 +31,10 @@ AXLIVE_API_URL = CONFIG.get("AXLIVE_API_URL")
 AXLIVE_MATCH_BASE_URL = CONFIG.get("AXLIVE_MATCH_BASE_URL")
 PROXY_BASE_URL = CONFIG.get("PROXY_BASE_URL")
 
+# refresh inkremental: URL lama yang token-nya masih berlaku tidak di-scrape ulang
+FULL_REFRESH = CONFIG.get("FULL_REFRESH", "false").lower() == "true"
+REFRESH_MARGIN = int(CONFIG.get("REFRESH_MARGIN", 15 * 60))
+
 # ==============================
 # Utilitas
 # ==============================
@@ -46,7 +52,7 @@ def get_live_match_ids():
     print(f"🔎 Mengambil daftar LIVE dari {AXLIVE_API_URL} ...")
 
     try:
-        res = requests.get(AXLIVE_API_URL, headers=headers, timeout=15)
+        res = http_client.get(AXLIVE_API_URL, headers=headers, timeout=15)
         res.raise_for_status()
         data = res.json()
 
@@ -156,30 +162,37 @@ def save_to_map(match_dict):
         with open(MAP_FILE, "r", encoding="utf-8") as f:
             old_data = json.load(f)
 
+    if FULL_REFRESH:
+        kept, todo_ids = {}, list(match_dict)
+    else:
+        kept, todo_ids = plan_refresh(old_data, match_dict, margin=REFRESH_MARGIN)
+    print(f"♻️ Token masih valid: {len(kept)} | Perlu scrape: {len(todo_ids)}")
+
     new_data = {}
-    total = len(match_dict)
-
-    print(f"\n🚀 Memulai scraping {total} pertandingan dengan Playwright ...")
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
-        page = context.new_page()
-
-        for idx, (match_id, start_at) in enumerate(match_dict.items(), 1):
-            print(f"\n[{idx}/{total}] ▶ Scraping ID: {match_id}")
-            try:
-                m3u8_url = extract_tokenized_m3u8(page, match_id)
-                if m3u8_url:
-                    new_data[match_id] = m3u8_url
-                    print(f"🌟 URL m3u8 berhasil: {masked_url(m3u8_url, 'https://cdn-rum.n2olabs.pro')}")
-                else:
-                    print(f"❌ {match_id} tidak ada m3u8.")
-            except Exception as e:
-                print(f"❌ Error ID {match_id}: {e}")
-
-        browser.close()
-
-    combined = {**old_data, **new_data}
+    total = len(todo_ids)
+
+    if todo_ids:
+        print(f"\n🚀 Memulai scraping {total} pertandingan dengan Playwright ...")
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            context = browser.new_context(user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
+            page = context.new_page()
+
+            for idx, match_id in enumerate(todo_ids, 1):
+                print(f"\n[{idx}/{total}] ▶ Scraping ID: {match_id}")
+                try:
+                    m3u8_url = extract_tokenized_m3u8(page, match_id)
+                    if m3u8_url:
+                        new_data[match_id] = m3u8_url
+                        print(f"🌟 URL m3u8 berhasil: {masked_url(m3u8_url, 'https://cdn-rum.n2olabs.pro')}")
+                    else:
+                        print(f"❌ {match_id} tidak ada m3u8.")
+                except Exception as e:
+                    print(f"❌ Error ID {match_id}: {e}")
+
+            browser.close()
+
+    combined = {**old_data, **kept, **new_data}
     ordered = {k: combined[k] for k in match_dict if k in combined}
 
     if not MAP_FILE.exists() or json.dumps(ordered, sort_keys=True) != json.dumps(old_data, sort_keys=True):
@@ -1,11 +1,13 @@
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-from bs4 import BeautifulSoup
 from pathlib import Path
 import datetime
 from zoneinfo import ZoneInfo
 from deep_translator import GoogleTranslator
 import sys
 
+from glossary import load_glossary
+from translation_memory import get_memory
+
 # Path ke file config
 MEDIASDATA_FILE = Path.home() / "mediasdata_file.txt"
 
@@ -30,41 +32,45 @@ USER_AGENT = (
     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
 
-def translate_vi_to_id(text: str) -> str:
-    # dictionary fallback
-    translations = {
-        "Giải Cỏ:": "", "Nga": "Rusia", "Anh": "Inggris", "Đài Loan": "Taiwan",
-        "Ngoại Hạng Đan Mạch": "Liga Denmark", "VĐQG Ý": "Serie A Italia", "Áo": "Austria",
-        "VĐQG Đức": "Bundesliga", "La Liga": "La Liga Spanyol", "Ấn Độ": "India", "Mông cổ": "Mongolia", "Mỹ": "Amerika",
-        "Hạng Nhì Tây Ban Nha": "Segunda División Spanyol", "Na Uy": "Norwegia", "Đức": "Jerman",
-        "VĐQG Pháp": "Ligue 1 Prancis", "Cúp C1": "Liga Champions UEFA", "Nam Phi": "Afrika Selatan",
-        "Cúp C2": "Liga Eropa UEFA", "Giao hữu": "Laga Persahabatan", "Thụy Sĩ": "Swiss", "Đan Mạch": "Denmark",
-        "V-League": "V-League Vietnam", "AFC Champions League": "Liga Champions Asia", "Tứ Xuyên": "Sichuan", 
-        "Hà Lan": "Belanda", "Bồ Đào Nha": "Portugal", "Bóng chuyền": "Bola voli", "Phần Lan": "Finlandia",
-        "Hạng 2": "Liga 2", "Ngoại Hạng": "Liga Primer", "Cúp": "Piala", "Xê Út": "Arab Saudi", "TRỰC TIẾP CẦU LÔNG": "BULUTANGKIS LANGSUNG", 
-        "VĐQG Brazil": "Serie A Brasil", "VĐQG Argentina": "Liga Argentina", "Triều Tiên": "Korea Utara",
-        "VĐQG Bulgaria": "Liga Bulgaria", "Hạng hai": "Liga 2", "VĐQG": "Liga", "Đài Loan": "Taiwan",
-        "Hạng nhất": "Devisi 1", "Ả Rập": "Arab", "Thụy Điển": "Swedia", "Ấn Độ": "India",
-        "Hàn Quốc": "Korea", "nữ": "Putri", "Trung Quốc": "Cina", "Mở Rộng": "Terbuka", "Huyền thoại": "Legendaris",
-        "Bóng chuyền nam": "Bola voli putra", "Bóng chuyền nữ": "Bola voli putri", "Giải Vô địch": "Kejuaraan",
-        "Bóng rổ": "Bola basket", "Nhật Bản": "Jepang", "Hạng Nhì": "Liga 2", "Trực tiếp": "Live", 
-        "Đơn Nữ": "Tunggal Putri", "Đơn Nam": "Tunggal Putra",
-        "Ba Lan": "Polandia", "Hy Lạp": "Yunani", "Ai Cập": "Mesir", "Pháp": "Perancis", "Giải Tennis": "Turnamen Tenis",
-        "Tây Ban Nha": "Spanyol", "Bỉ": "Belgia", "Thổ Nhĩ Kỳ": "Turki", "Đài Bắc Trung Hoa": "Cina Taipei",
-    }
+# field match diambil langsung di browser, tanpa kirim seluruh DOM ke Python
+MATCH_BOXES_JS = """
+() => Array.from(document.querySelectorAll(".box_02.click")).map(box => {
+    const li = box.parentElement?.closest("li");
+    const date = li ? li.querySelector(".box_01 .date") : null;
+    return {
+        link: box.getAttribute("link") || "",
+        clubs: Array.from(box.querySelectorAll(".club .name")).map(el => el.textContent.trim()),
+        date: date ? date.textContent.trim() : null,
+    };
+})
+"""
+
+# kamus nama liga/negara Vietnam -> Indonesia (glossary/vi_id.json)
+VI_GLOSSARY = load_glossary("vi_id")
 
+def translate_vi_to_id(text: str) -> str:
     if text.isascii():
         return text.strip()
 
+    # tier offline: nama yang seluruhnya ada di glossary tidak perlu ke jaringan
+    offline = VI_GLOSSARY.translate(text)
+    if offline:
+        return offline
+
+    memory = get_memory()
+    remembered = memory.get(text, "vi", "id")
+    if remembered:
+        return remembered
+
     # Coba API translator
     try:
-        return GoogleTranslator(source="vi", target="id").translate(text)
+        result = GoogleTranslator(source="vi", target="id").translate(text)
+        memory.put(text, result, "vi", "id")
+        return result
     except Exception as e:
         print(f"⚠️ Translate API error: {text} --> {e}", file=sys.stderr)
-        # fallback dictionary
-        for vi, idn in translations.items():
-            text = text.replace(vi, idn)
-        return text.strip()
+        # fallback dictionary (longest-match, sebagian saja)
+        return VI_GLOSSARY.replace(text)
 
 def fetch_m3u_with_playwright():
     try:
@@ -91,45 +97,37 @@ def fetch_m3u_with_playwright():
                 browser.close()
                 return ""
 
-            html = page.content()
+            match_boxes = page.evaluate(MATCH_BOXES_JS)
             browser.close()
 
     except Exception as e:
         print(f"🔥 Gagal mengambil data Playwright: {e}", file=sys.stderr)
         return ""
 
-    # Optional debug simpan HTML
-    with open("page.html", "w", encoding="utf-8") as f:
-        f.write(html)
-
-    soup = BeautifulSoup(html, "html.parser")
     output = ["#EXTM3U\n"]
     seen = set()
 
-    match_boxes = soup.select(".box_02.click")
     print(f"📦 Found {len(match_boxes)} match boxes", file=sys.stderr)
 
     for box in match_boxes:
-        match_id = box.get("link", "").split("-")[-1].replace(".html", "")
+        match_id = box["link"].split("-")[-1].replace(".html", "")
         if not match_id:
             print("❌ Missing match_id, skipped", file=sys.stderr)
             continue
 
-        clubs = box.select(".club .name")
+        clubs = box["clubs"]
         if len(clubs) != 2:
             print("❌ Incomplete club info, skipped", file=sys.stderr)
             continue
 
-        team_a = translate_vi_to_id(clubs[0].text.strip())
-        team_b = translate_vi_to_id(clubs[1].text.strip())
+        team_a = translate_vi_to_id(clubs[0])
+        team_b = translate_vi_to_id(clubs[1])
 
-        parent_li = box.find_parent("li")
-        time_raw = parent_li.select_one(".box_01 .date")
-        if not time_raw:
+        if not box["date"]:
             print("❌ Missing date info, skipped", file=sys.stderr)
             continue
 
-        date_time_str = time_raw.text.strip().replace(" ", "")
+        date_time_str = box["date"].replace(" ", "")
 
         try:
             current_year = datetime.datetime.now().year
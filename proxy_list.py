@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import http_client
+
+# ==========================
+# KONFIGURASI
+# ==========================
+# Disimpan antar run lewat actions/cache (lihat workflow), bisa di-override via env
+CACHE_DIR = Path(os.environ.get(
+    "PROXY_LIST_CACHE_DIR",
+    Path(__file__).parent / "proxy_list_cache"
+))
+
+# selama TTL daftar dari disk dipakai langsung, setelahnya divalidasi ulang (conditional GET)
+TTL = float(os.environ.get("PROXY_LIST_TTL", 30 * 60))
+
+SCHEMES = {"http", "https", "socks4", "socks5", "socks5h"}
+DEFAULT_SCHEME = "http"
+
+
+# ==========================
+# Normalisasi
+# ==========================
+def normalize_proxy(line):
+    """Ubah satu baris daftar proxy ke bentuk `scheme://[user:pass@]host:port`.
+
+    "1.2.3.4:8080" dianggap http. Baris kosong, komentar, skema asing atau
+    port tidak valid menghasilkan None.
+    """
+    line = line.split("#", 1)[0].strip()
+    if not line:
+        return None
+    if "://" not in line:
+        line = f"{DEFAULT_SCHEME}://{line}"
+
+    try:
+        parts = urlsplit(line)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if scheme not in SCHEMES or not host or not port:
+        return None
+
+    if ":" in host:
+        host = f"[{host}]"
+    auth = ""
+    if parts.username:
+        auth = parts.username + (f":{parts.password}" if parts.password else "") + "@"
+    return f"{scheme}://{auth}{host}:{port}"
+
+
+def parse_proxy_list(text):
+    return list(dict.fromkeys(
+        p for p in (normalize_proxy(line) for line in text.splitlines()) if p
+    ))
+
+
+# ==========================
+# Provider
+# ==========================
+def _cache_path(url):
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def _read_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_cache(path, entry):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+
+def load_proxy_list(url, ttl=TTL, timeout=15):
+    """Daftar proxy bersih (dinormalisasi & tanpa duplikat) dari `url`.
+
+    Disimpan di disk; selama TTL tidak ada request sama sekali, setelahnya
+    divalidasi pakai ETag/Last-Modified. Kalau download gagal, salinan lama
+    tetap dipakai.
+    """
+    if not url:
+        return []
+
+    path = _cache_path(url)
+    cached = _read_cache(path)
+    if cached and time.time() - cached.get("fetched_at", 0) < ttl:
+        print(f"🔌 Proxy list dari cache: {len(cached['proxies'])} proxy", file=sys.stderr)
+        return cached["proxies"]
+
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        resp = http_client.get(url, headers=headers, timeout=timeout)
+        if resp.status_code == 304 and cached:
+            cached["fetched_at"] = time.time()
+            _write_cache(path, cached)
+            print(f"🔌 Proxy list tidak berubah (304): {len(cached['proxies'])} proxy", file=sys.stderr)
+            return cached["proxies"]
+        resp.raise_for_status()
+    except Exception as e:
+        if cached:
+            print(f"⚠️ Gagal ambil proxy list ({e}), pakai salinan lama", file=sys.stderr)
+            return cached["proxies"]
+        print(f"⚠️ Gagal ambil proxy list: {e}", file=sys.stderr)
+        return []
+
+    proxies = parse_proxy_list(resp.text)
+    _write_cache(path, {
+        "url": url,
+        "fetched_at": time.time(),
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "proxies": proxies,
+    })
+    print(f"🔌 Total proxy terambil: {len(proxies)}", file=sys.stderr)
+    return proxies
@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import http_client
+from proxy_reputation import get_reputation
+
+# ==========================
+# KONFIGURASI
+# ==========================
+PROBE_TIMEOUT = 5
+PROBE_WORKERS = 50
+
+# proxy dikeluarkan dari daftar sehat setelah gagal berturut-turut sebanyak ini
+MAX_FAILURES = 2
+
+
+# ==========================
+# Proxy Pool
+# ==========================
+class ProxyStats:
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.ok = 0
+        self.fail = 0
+        self.streak = 0
+        self.latency = None
+        self.inflight = 0
+
+    def record(self, ok, elapsed=None):
+        if ok:
+            self.ok += 1
+            self.streak = 0
+            # rata-rata bergerak supaya latency terbaru lebih berpengaruh
+            self.latency = elapsed if self.latency is None else 0.7 * self.latency + 0.3 * elapsed
+        else:
+            self.fail += 1
+            self.streak += 1
+
+    @property
+    def score(self):
+        total = self.ok + self.fail
+        rate = self.ok / total if total else 0
+        return (-rate, self.latency if self.latency is not None else 99)
+
+
+class ProxyPool:
+    """Kelola daftar proxy: probe paralel di awal, urutkan sesuai latency &
+    tingkat sukses, pakai ulang proxy tercepat per host, dan turunkan proxy
+    yang gagal. Aman dipakai dari banyak thread sekaligus.
+
+    Hasil tiap percobaan dicatat ke reputasi proxy on-disk; proxy yang
+    baru saja gagal (masih cool-down) tidak ikut di-probe.
+    """
+
+    def __init__(self, proxies, headers=None, timeout=10, reputation=None):
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.reputation = reputation or get_reputation()
+        self.stats = {p: ProxyStats(p) for p in self.reputation.rank(proxies)}
+        self.healthy = []
+        self.sticky = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, url, proxy, timeout):
+        start = time.monotonic()
+        r = http_client.get(
+            url,
+            headers=self.headers,
+            timeout=timeout,
+            proxies={"http": proxy, "https": proxy},
+            verify=False
+        )
+        if r.status_code != 200:
+            raise RuntimeError(f"status {r.status_code}")
+        return r.text, time.monotonic() - start
+
+    def probe(self, url, timeout=PROBE_TIMEOUT, workers=PROBE_WORKERS):
+        """Tes semua proxy ke `url` bersamaan, simpan yang sehat urut tercepat."""
+        print(f"🩺 Probe {len(self.stats)} proxy ke {url} ...")
+
+        def check(proxy):
+            try:
+                _, elapsed = self._fetch(url, proxy, timeout)
+                self.reputation.record(proxy, True, elapsed)
+                return proxy, True, elapsed
+            except Exception:
+                self.reputation.record(proxy, False)
+                return proxy, False, None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(self.stats)))) as executor:
+            for fut in as_completed([executor.submit(check, p) for p in self.stats]):
+                proxy, ok, elapsed = fut.result()
+                with self._lock:
+                    self.stats[proxy].record(ok, elapsed)
+
+        with self._lock:
+            self.healthy = sorted(
+                (s for s in self.stats.values() if s.ok),
+                key=lambda s: s.score
+            )
+
+        if self.healthy:
+            best = self.healthy[0]
+            print(f"✅ Proxy sehat: {len(self.healthy)} (tercepat {best.proxy} {best.latency:.2f}s)")
+        else:
+            print("⚠️ Tidak ada proxy yang lolos probe, pakai seluruh daftar.")
+        return [s.proxy for s in self.healthy]
+
+    def _candidates(self, host):
+        with self._lock:
+            pool = self.healthy or list(self.stats.values())
+            sticky = self.sticky.get(host)
+            # proxy sticky host ini duluan, lalu yang paling sedikit dipakai & terbaik
+            return sorted(
+                pool,
+                key=lambda s: (s.proxy != sticky, s.inflight, s.score)
+            )
+
+    def get(self, url):
+        host = urlparse(url).hostname
+
+        for stats in self._candidates(host):
+            with self._lock:
+                stats.inflight += 1
+            try:
+                text, elapsed = self._fetch(url, stats.proxy, self.timeout)
+            except Exception:
+                self.reputation.record(stats.proxy, False)
+                with self._lock:
+                    stats.inflight -= 1
+                    stats.record(False)
+                    if self.sticky.get(host) == stats.proxy:
+                        del self.sticky[host]
+                    if stats.streak >= MAX_FAILURES and stats in self.healthy:
+                        self.healthy.remove(stats)
+                continue
+
+            self.reputation.record(stats.proxy, True, elapsed)
+            with self._lock:
+                stats.inflight -= 1
+                stats.record(True, elapsed)
+                self.sticky[host] = stats.proxy
+            print(f"↪️ OK: {url} via {stats.proxy}")
+            return text
+
+        print(f"❌ Gagal ambil {url} dengan semua proxy.")
+        return None
+
+    @property
+    def workers(self):
+        return max(1, len(self.healthy))
@@ -0,0 +1,156 @@
+import atexit
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+# ==========================
+# KONFIGURASI
+# ==========================
+# Disimpan antar run lewat actions/cache (lihat workflow), bisa di-override via env
+DB_FILE = Path(os.environ.get(
+    "PROXY_REPUTATION_FILE",
+    Path(__file__).parent / "proxy_reputation.sqlite"
+))
+
+# bobot sukses/gagal lama berkurang separuh setiap HALF_LIFE detik
+HALF_LIFE = 24 * 3600
+
+# proxy yang gagal di-skip selama COOLDOWN * 2^(gagal berturut-turut - 1), maksimal MAX_COOLDOWN
+COOLDOWN = 10 * 60
+MAX_COOLDOWN = 6 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS proxies (
+    proxy          TEXT PRIMARY KEY,
+    ok             REAL NOT NULL DEFAULT 0,
+    fail           REAL NOT NULL DEFAULT 0,
+    streak         INTEGER NOT NULL DEFAULT 0,
+    latency        REAL,
+    last_seen      REAL NOT NULL,
+    cooldown_until REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+# ==========================
+# Proxy Reputation
+# ==========================
+class ProxyReputation:
+    """Reputasi proxy on-disk (SQLite) yang dipakai bersama semua script proxy.
+
+    Per proxy disimpan jumlah sukses/gagal (meluruh seiring waktu), latency,
+    waktu terakhir dipakai, dan masa cool-down setelah gagal.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(SCHEMA)
+
+    @staticmethod
+    def _decay(value, last_seen, now):
+        return value * 0.5 ** (max(0, now - last_seen) / HALF_LIFE)
+
+    def record(self, proxy, ok, latency=None):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT ok, fail, streak, latency, last_seen FROM proxies WHERE proxy = ?",
+                (proxy,)
+            ).fetchone()
+
+            good, bad, streak, avg, last_seen = row or (0, 0, 0, None, now)
+            good = self._decay(good, last_seen, now)
+            bad = self._decay(bad, last_seen, now)
+
+            if ok:
+                good += 1
+                streak = 0
+                cooldown_until = 0
+                if latency is not None:
+                    avg = latency if avg is None else 0.7 * avg + 0.3 * latency
+            else:
+                bad += 1
+                streak += 1
+                cooldown_until = now + min(MAX_COOLDOWN, COOLDOWN * 2 ** (streak - 1))
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO proxies "
+                "(proxy, ok, fail, streak, latency, last_seen, cooldown_until) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (proxy, good, bad, streak, avg, now, cooldown_until)
+            )
+            self.recorded += 1
+
+    def rank(self, proxies, include_cooling=False):
+        """Urutkan proxy dari yang paling mungkin jalan.
+
+        Proxy yang masih cool-down dibuang (atau ditaruh paling belakang
+        kalau `include_cooling`, atau kalau semuanya sedang cool-down).
+        Proxy baru dianggap peluang 50%, urutan yang skornya sama diacak.
+        """
+        proxies = list(dict.fromkeys(p for p in proxies if p))
+        now = time.time()
+
+        with self._lock:
+            rows = {}
+            for i in range(0, len(proxies), 500):
+                part = proxies[i:i + 500]
+                rows.update(
+                    (r[0], r[1:]) for r in self._conn.execute(
+                        "SELECT proxy, ok, fail, latency, last_seen, cooldown_until FROM proxies "
+                        f"WHERE proxy IN ({','.join('?' * len(part))})",
+                        part
+                    )
+                )
+
+        ready, cooling = [], []
+        random.shuffle(proxies)
+        for proxy in proxies:
+            good, bad, latency, last_seen, cooldown_until = rows.get(proxy, (0, 0, None, now, 0))
+            good = self._decay(good, last_seen, now)
+            bad = self._decay(bad, last_seen, now)
+            chance = (good + 1) / (good + bad + 2)
+            key = (-chance, latency if latency is not None else 99)
+            (cooling if cooldown_until > now else ready).append((key, proxy))
+
+        ready.sort(key=lambda x: x[0])
+        result = [p for _, p in ready]
+        if include_cooling or not ready:
+            cooling.sort(key=lambda x: x[0])
+            result += [p for _, p in cooling]
+
+        print(
+            f"📇 Reputasi proxy: {len(ready)} siap, {len(cooling)} cool-down",
+            file=sys.stderr
+        )
+        return result
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_reputation = None
+_reputation_lock = threading.Lock()
+
+
+def get_reputation():
+    """Instance bersama per proses, ditutup otomatis saat proses selesai."""
+    global _reputation
+    with _reputation_lock:
+        if _reputation is None:
+            _reputation = ProxyReputation()
+            atexit.register(_reputation.close)
+    return _reputation
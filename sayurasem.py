@@ -1,9 +1,13 @@
-import requests, urllib.parse
+import urllib.parse
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta, date
 from pytz import timezone
 from pathlib import Path
 import urllib3
+from concurrent.futures import ThreadPoolExecutor
+
+from proxy_list import load_proxy_list
+from proxy_pool import ProxyPool
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -38,27 +42,11 @@ class JetItem:
         self.starttime = starttime
 
 def load_proxies():
-    try:
-        print("🌐 Mengambil daftar proxy...")
-        resp = requests.get(PROXY_LIST_URL, timeout=10)
-        resp.raise_for_status()
-        return [p.strip() for p in resp.text.splitlines() if p.strip()]
-    except Exception as e:
-        print(f"⚠️ Gagal ambil proxy: {e}")
-        return []
+    print("🌐 Mengambil daftar proxy...")
+    return load_proxy_list(PROXY_LIST_URL, timeout=10)
 
-def safe_get(url, proxies):
-    for p in proxies:
-        proxy = {"http": p, "https": p}
-        try:
-            r = requests.get(url, headers=HEADERS, timeout=10, proxies=proxy, verify=False)
-            if r.status_code == 200:
-                print(f"↪️ OK: {url} via {p}")
-                return r.text
-        except:
-            continue
-    print(f"❌ Gagal ambil {url} dengan semua proxy.")
-    return None
+def safe_get(url, pool):
+    return pool.get(url)
 
 def parse_playing(html):
     soup = BeautifulSoup(html, "html.parser")
@@ -123,8 +111,8 @@ def resolve_m3u8(url):
         return M3U8_TEMPLATE_URL.format(channel_id=cid), cid
     except: return url, None
 
-def get_links(live_url, proxies):
-    html = safe_get(live_url, proxies)
+def get_links(live_url, pool):
+    html = safe_get(live_url, pool)
     if not html:
         return []
     soup = BeautifulSoup(html, "html.parser")
@@ -168,9 +156,15 @@ def main():
         print("❌ Tidak ada proxy tersedia.")
         return
 
-    fixture_html = safe_get(f"https://{DOMAIN}/fixture/all.html", proxies)
-    upcoming_html = safe_get(f"https://{DOMAIN}/upcoming.html", proxies)
-    playing_html = safe_get(f"https://{DOMAIN}/playing.html", proxies)
+    pool = ProxyPool(proxies, headers=HEADERS)
+    pool.probe(f"https://{DOMAIN}/")
+
+    # tiga halaman daftar diambil paralel
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        fixture_html, upcoming_html, playing_html = executor.map(
+            lambda path: safe_get(f"https://{DOMAIN}/{path}", pool),
+            ["fixture/all.html", "upcoming.html", "playing.html"]
+        )
 
     fixtures = parse_fixture(fixture_html) if fixture_html else []
     upcoming = parse_upcoming(upcoming_html) if upcoming_html else []
@@ -182,7 +176,12 @@ def main():
     print(f"\n📆 Total Pertandingan: {len(focus)}")
     for item in focus:
         print(f"🕒 {item.starttime.strftime('%d/%m %H:%M')} | {item.league} | {item.title}")
-        item.links = get_links(item.links[0].url, proxies)
+
+    # halaman detail diambil paralel, tersebar di proxy yang sehat
+    with ThreadPoolExecutor(max_workers=min(pool.workers, 8)) as executor:
+        results = executor.map(lambda item: get_links(item.links[0].url, pool), focus)
+        for item, links in zip(focus, results):
+            item.links = links
 
     save_to_m3u(focus)
 
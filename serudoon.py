@@ -1,14 +1,20 @@
-import requests
-import random
+import asyncio
+import http_client
 import time
 import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+from proxy_list import load_proxy_list
+from proxy_reputation import get_reputation
+
 # Konstanta path
 MAPPING_FILE = Path.home() / "cool_mapping.txt"
-CACHE_FILE = Path("proxy_cache.txt")
-FAILED_FILE = Path("proxy_failed.txt")
+
+# race proxy: sekian proxy teratas dicoba bersamaan, jendela melebar kalau semua gagal
+PROXY_TIMEOUT = 10
+RACE_SIZE = 8
+RACE_MAX = 64
 
 
 # ===============================
@@ -62,35 +68,88 @@ def parse_mapping_file(path):
 # PROXY
 # ===============================
 def get_proxy_list(url):
-    try:
-        res = requests.get(url, timeout=10)
-        res.raise_for_status()
-        return res.text.strip().splitlines()
-    except Exception as e:
-        print(f"[!] Gagal ambil proxy list: {e}", file=sys.stderr)
-        return []
+    return load_proxy_list(url, timeout=10)
 
 
 def try_proxy(api_url, proxy, headers):
     proxies = {"http": proxy, "https": proxy}
+    reputation = get_reputation()
+    start = time.monotonic()
     try:
         print(f"[•] Mencoba proxy: {proxy}", file=sys.stderr)
-        res = requests.get(api_url, headers=headers, proxies=proxies, timeout=10)
+        res = http_client.get(api_url, headers=headers, proxies=proxies, timeout=PROXY_TIMEOUT)
         res.raise_for_status()
-        return res.json()
+        data = res.json()
+        reputation.record(proxy, True, time.monotonic() - start)
+        return data
     except Exception as e:
         print(f"[×] Proxy gagal: {proxy} → {e}", file=sys.stderr)
+        reputation.record(proxy, False)
+        return None
+
+
+async def try_proxy_async(api_url, proxy, headers):
+    reputation = get_reputation()
+    start = time.monotonic()
+    try:
+        async with http_client.async_client(
+            proxy=proxy, timeout=PROXY_TIMEOUT
+        ) as client:
+            res = await client.get(api_url, headers=headers)
+            res.raise_for_status()
+            data = res.json()
+        if not isinstance(data, dict):
+            raise ValueError("respon bukan object JSON")
+        reputation.record(proxy, True, time.monotonic() - start)
+        return data
+    except Exception as e:
+        print(f"[×] Proxy gagal: {proxy} → {type(e).__name__}: {e}", file=sys.stderr)
+        reputation.record(proxy, False)
         return None
 
 
-def simpan_cache_berhasil(proxy):
-    CACHE_FILE.write_text(proxy)
-    print(f"[✓] Proxy disimpan ke cache: {proxy}", file=sys.stderr)
+async def race_proxies(api_url, proxies, headers):
+    """Tembak API lewat beberapa proxy teratas sekaligus.
+
+    Respon JSON valid pertama dipakai, sisanya dibatalkan. Kalau satu
+    batch gagal semua, batch berikutnya dua kali lebih lebar.
+    """
+    pos, window = 0, RACE_SIZE
+
+    while pos < len(proxies):
+        batch = proxies[pos:pos + window]
+        print(f"[•] Race {len(batch)} proxy (#{pos + 1}-{pos + len(batch)})", file=sys.stderr)
+
+        tasks = {
+            asyncio.create_task(try_proxy_async(api_url, proxy, headers)): proxy
+            for proxy in batch
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    data = task.result()
+                    if data:
+                        return tasks[task], data
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
+        pos += len(batch)
+        window = min(window * 2, RACE_MAX)
 
-def simpan_cache_gagal(proxy):
-    with FAILED_FILE.open("a") as f:
-        f.write(proxy + "\n")
+    return None, None
+
+
+def find_data_sequential(api_url, proxies, headers):
+    for proxy in proxies:
+        data = try_proxy(api_url, proxy, headers)
+        if data:
+            return proxy, data
+        time.sleep(1)
+    return None, None
 
 
 # ===============================
@@ -191,35 +250,19 @@ def main():
         print("❌ PROXY_LIST_URL atau URL tidak ditemukan dalam mapping.", file=sys.stderr)
         return 1
 
-    proxies = get_proxy_list(proxy_url)
-    random.shuffle(proxies)
-    tried = set()
-
-    if CACHE_FILE.exists():
-        cached = CACHE_FILE.read_text().strip()
-        if cached:
-            data = try_proxy(api_url, cached, headers)
-            if data:
-                tampilkan_playlist(data, constants, mapping, default)
-                print("[✓] Playlist diambil dari cache.", file=sys.stderr)
-                return 0
-            simpan_cache_gagal(cached)
-            tried.add(cached)
+    # urut dari proxy yang paling mungkin jalan, yang baru gagal di-skip dulu
+    proxies = get_reputation().rank(get_proxy_list(proxy_url))
 
-    for proxy in proxies:
-        if proxy in tried:
-            continue
-
-        data = try_proxy(api_url, proxy, headers)
+    if http_client.httpx is not None:
+        proxy, data = asyncio.run(race_proxies(api_url, proxies, headers))
+    else:
+        print("[!] httpx tidak ada, proxy dicoba satu per satu.", file=sys.stderr)
+        proxy, data = find_data_sequential(api_url, proxies, headers)
 
-        if data:
-            simpan_cache_berhasil(proxy)
-            tampilkan_playlist(data, constants, mapping, default)
-            return 0
-
-        simpan_cache_gagal(proxy)
-        tried.add(proxy)
-        time.sleep(1)
+    if data:
+        print(f"[✓] Proxy berhasil: {proxy}", file=sys.stderr)
+        tampilkan_playlist(data, constants, mapping, default)
+        return 0
 
     print("❌ Semua proxy gagal.", file=sys.stderr)
     return 1
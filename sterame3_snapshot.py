@@ -0,0 +1,144 @@
+import datetime
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import http_client
+
+# ==========================
+# KONFIGURASI
+# ==========================
+# Dipakai bersama cinhodal.py (M3U) & cinhodal1.py (map5.json), disimpan antar
+# workflow lewat actions/cache. Bisa di-override via env.
+SNAPSHOT_DIR = Path(os.environ.get(
+    "STERAME3_SNAPSHOT_DIR",
+    Path(__file__).parent / "sterame3_snapshot"
+))
+
+# umur maksimal snapshot (detik) sebelum API dipanggil lagi
+TTL = float(os.environ.get("STERAME3_SNAPSHOT_TTL", 10 * 60))
+
+# Kategori yang dilewatkan filter waktu
+EXEMPT_CATEGORIES = [
+    "fight",
+    "motor-sports",
+    "tennis"
+]
+
+TZ = ZoneInfo("Asia/Jakarta")
+
+
+# ==========================
+# Filter match
+# ==========================
+def event_time(match):
+    return datetime.datetime.fromtimestamp(match["date"] / 1000, ZoneInfo("UTC")).astimezone(TZ)
+
+
+def recent_matches(matches, apply_time_filter=True, now=None, hours=2):
+    """Buang match yang mulai lebih dari `hours` jam lalu (kecuali kategori tertentu)."""
+    if not apply_time_filter:
+        return list(matches)
+
+    now = now or datetime.datetime.now(TZ)
+    limit = now - datetime.timedelta(hours=hours)
+    return [
+        m for m in matches
+        if m.get("category", "").lower() in EXEMPT_CATEGORIES or event_time(m) >= limit
+    ]
+
+
+# ==========================
+# Snapshot
+# ==========================
+class FeedSnapshot:
+    """Cache on-disk berumur pendek untuk daftar match dan JSON stream per
+    (source, id). Script pertama dalam satu siklus yang fetch ke API,
+    script berikutnya cukup baca file selama belum lewat TTL.
+
+    Satu file per URL (ditulis atomik), jadi aman dipakai dari banyak thread.
+    File yang sudah lewat TTL dihapus saat snapshot dibuka, supaya folder
+    yang disimpan actions/cache tidak terus membesar.
+    """
+
+    def __init__(self, matches_url, stream_url, headers=None, directory=SNAPSHOT_DIR, ttl=TTL):
+        self.matches_url = matches_url
+        self.stream_url = stream_url
+        self.headers = headers or {}
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.prune()
+
+    def prune(self):
+        """Hapus file snapshot (dan sisa .tmp) yang lebih tua dari TTL."""
+        if not self.directory.is_dir():
+            return 0
+        limit = time.time() - self.ttl
+        removed = 0
+        for path in self.directory.iterdir():
+            if path.suffix not in (".json", ".tmp"):
+                continue
+            try:
+                if path.stat().st_mtime < limit:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def _path(self, url):
+        return self.directory / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.json"
+
+    def _load(self, url):
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception:
+            return None
+        if entry.get("url") != url or time.time() - entry.get("fetched_at", 0) > self.ttl:
+            return None
+        return entry
+
+    def _store(self, url, data):
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "fetched_at": time.time(), "data": data}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _get(self, url, timeout):
+        entry = self._load(url)
+        with self._lock:
+            if entry:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry:
+            return entry["data"]
+
+        res = http_client.get(url, headers=self.headers, timeout=timeout)
+        res.raise_for_status()
+        data = res.json()
+        self._store(url, data)
+        return data
+
+    def matches(self, timeout=15):
+        return self._get(self.matches_url, timeout)
+
+    def streams(self, source_type, source_id, timeout=10):
+        return self._get(self.stream_url.format(source_type, source_id), timeout)
+
+    def report(self):
+        print(
+            f"🗂️ Snapshot sterame3: {self.hits} dari cache, {self.misses} dari API",
+            file=sys.stderr
+        )
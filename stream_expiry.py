@@ -0,0 +1,197 @@
+import base64
+import json
+import os
+import re
+import sys
+import time
+from urllib.parse import urlparse, parse_qs, unquote
+
+# ==========================
+# KONFIGURASI
+# ==========================
+# URL dianggap "hampir expired" kalau sisa umurnya kurang dari ini (detik)
+DEFAULT_MARGIN = 15 * 60
+
+# epoch lebih jauh dari ini di masa depan dianggap bukan expiry (angka acak di token)
+MAX_TTL = 7 * 24 * 3600
+
+EPOCH_RE = re.compile(r"(?<!\d)(1[5-9]\d{8})(?!\d)")
+
+# auth_key procdnlive berisi waktu URL dibuat (bukan expiry); masa berlakunya
+# ~12 jam (terlihat dari selisih dengan wsABSTime/fast5cdn yang di-resolve di run sama)
+PROCDNLIVE_TTL = int(os.environ.get("PROCDNLIVE_TTL", 12 * 3600))
+
+# segmen path berupa epoch milidetik, mis. fast5cdn /<hash>/1768831628895/channel-29/
+EPOCH_MS_SEGMENT_RE = re.compile(r"^1[5-9]\d{11}$")
+
+
+# ==========================
+# PARSER EXPIRY
+# ==========================
+def _jwt_exp(token):
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        data = json.loads(base64.urlsafe_b64decode(payload))
+        exp = data.get("exp")
+        return int(exp) if exp else None
+    except Exception:
+        return None
+
+
+def _epoch_in(value):
+    if not value:
+        return None
+
+    exp = _jwt_exp(value)
+    if exp:
+        return exp
+
+    m = EPOCH_RE.search(value)
+    return int(m.group(1)) if m else None
+
+
+def parse_expiry_info(url):
+    """Ambil (expiry epoch detik, dihitung dari waktu terbit?) dari URL stream,
+    None kalau tidak ada.
+
+    - procdnlive : auth_key=<waktu terbit>-rand-uid-hash, waktu terbit bisa
+                   diberi prefix (mis. 300000 + 1768787777), jadi diambil 10 digit
+                   terakhir; expiry = waktu terbit + PROCDNLIVE_TTL
+    - pro2cdnlive: wsABSTime=<expiry>
+    - fast5cdn   : expiry epoch milidetik sebagai segmen path
+    - n2olabs    : token / verify (JWT exp atau epoch di dalamnya)
+    - umum       : expires / exp / e, plus URL asli di parameter url=
+    """
+    if not url:
+        return None
+
+    try:
+        parsed = urlparse(url)
+        qs = parse_qs(parsed.query)
+    except Exception:
+        return None
+
+    # (expiry, dihitung dari waktu terbit)
+    candidates = []
+
+    auth_key = qs.get("auth_key", [""])[0]
+    if auth_key:
+        head = auth_key.split("-", 1)[0]
+        if head.isdigit() and len(head) >= 10:
+            candidates.append((int(head[-10:]) + PROCDNLIVE_TTL, True))
+
+    abs_time = qs.get("wsABSTime", [""])[0]
+    if abs_time.isdigit() and len(abs_time) >= 10:
+        candidates.append((int(abs_time[:10]), False))
+
+    for segment in parsed.path.split("/"):
+        if EPOCH_MS_SEGMENT_RE.match(segment):
+            candidates.append((int(segment) // 1000, False))
+
+    for key in ("expires", "exp", "e"):
+        val = qs.get(key, [""])[0]
+        if val.isdigit() and len(val) >= 10:
+            candidates.append((int(val[:10]), False))
+
+    for key in ("token", "verify"):
+        exp = _epoch_in(unquote(qs.get(key, [""])[0]))
+        if exp:
+            candidates.append((exp, False))
+
+    # URL asli yang dibungkus proxy (mis. n2olabs ?url=...)
+    inner = qs.get("url", [""])[0]
+    if inner and inner != url:
+        info = parse_expiry_info(unquote(inner))
+        if info:
+            candidates.append(info)
+
+    limit = time.time() + MAX_TTL
+    candidates = [c for c in candidates if c[0] <= limit]
+    return min(candidates) if candidates else None
+
+
+def parse_expiry(url):
+    """Waktu expired (epoch detik) dari URL stream, None kalau tidak ada."""
+    info = parse_expiry_info(url)
+    return info[0] if info else None
+
+
+def is_fresh(url, margin=DEFAULT_MARGIN, now=None):
+    """True kalau URL masih berlaku lebih dari `margin` detik lagi."""
+    exp = parse_expiry(url)
+    if exp is None:
+        return False
+    now = time.time() if now is None else now
+    return exp - now > margin
+
+
+# ==========================
+# REFRESH INKREMENTAL
+# ==========================
+def plan_refresh(old_map, keys, margin=DEFAULT_MARGIN, now=None):
+    """Pisahkan key menjadi (entry lama yang masih valid, key yang perlu di-resolve).
+
+    Entry lama tanpa expiry yang bisa dibaca selalu di-resolve ulang.
+    """
+    kept, todo = {}, []
+    for key in keys:
+        url = old_map.get(key)
+        if isinstance(url, str) and is_fresh(url, margin, now):
+            kept[key] = url
+        else:
+            todo.append(key)
+    return kept, todo
+
+
+# ==========================
+# CEK MANUAL
+# ==========================
+# python stream_expiry.py map6.json [--written-at EPOCH]
+# -> per host: berapa URL yang expiry-nya terbaca, dan berapa yang expiry-nya
+#    sudah lewat saat map ditulis (tanda parser salah baca, mis. waktu terbit
+#    dianggap expiry). Waktu tulis default = mtime file; setelah git checkout
+#    mtime tidak berarti, jadi isi --written-at dengan waktu run generator.
+if __name__ == "__main__":
+    import argparse
+    import statistics
+    from collections import defaultdict
+
+    parser = argparse.ArgumentParser(description="Cek parse_expiry terhadap map JSON")
+    parser.add_argument("paths", nargs="*", default=["map6.json"])
+    parser.add_argument("--written-at", type=float, default=None)
+    args = parser.parse_args()
+
+    failed = 0
+    for path in args.paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        written_at = args.written_at or os.path.getmtime(path)
+
+        expiries, missing = defaultdict(list), defaultdict(int)
+        for url in data.values():
+            if not isinstance(url, str):
+                continue
+            host = urlparse(url).hostname or "?"
+            exp = parse_expiry(url)
+            if exp is None:
+                missing[host] += 1
+            else:
+                expiries[host].append(exp)
+
+        print(f"📄 {path} (ditulis {time.strftime('%Y-%m-%d %H:%M', time.gmtime(written_at))} UTC)")
+        for host in sorted(set(expiries) | set(missing)):
+            values = expiries.get(host, [])
+            early = sum(1 for e in values if e <= written_at)
+            line = f"   {host}: {len(values)} terbaca, {missing.get(host, 0)} tidak"
+            if values:
+                hours = (statistics.median(values) - written_at) / 3600
+                line += f", median sisa {hours:+.1f} jam"
+            if early:
+                line += f", ❌ {early} sudah expired saat ditulis"
+            print(line)
+            failed += missing.get(host, 0) + early
+
+    sys.exit(1 if failed else 0)
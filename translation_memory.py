@@ -0,0 +1,159 @@
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+# ==========================
+# KONFIGURASI
+# ==========================
+# Disimpan antar run lewat actions/cache (lihat workflow), bisa di-override via env
+DB_FILE = Path(os.environ.get(
+    "TRANSLATION_MEMORY_FILE",
+    Path(__file__).parent / "translation_memory.sqlite"
+))
+
+# entry lebih tua dari ini dihapus saat dibuka, 0 = tidak pernah
+TTL_DAYS = float(os.environ.get("TRANSLATION_MEMORY_TTL_DAYS", 30))
+
+# kode bahasa dinormalisasi supaya script yang memakai alias berbeda berbagi entry
+SOURCE_ALIASES = {
+    "zh": "zh-CN",
+    "zh-cn": "zh-CN",
+    "zh_cn": "zh-CN",
+    "zh-hans": "zh-CN",
+    "zh-chs": "zh-CN",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source      TEXT NOT NULL,
+    target      TEXT NOT NULL,
+    text        TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    updated_at  REAL NOT NULL,
+    PRIMARY KEY (source, target, text)
+)
+"""
+
+
+# ==========================
+# Translation Memory
+# ==========================
+def normalize_lang(code):
+    return SOURCE_ALIASES.get(code.lower(), code) if code else code
+
+
+class TranslationMemory:
+    """Memori terjemahan on-disk (SQLite) yang dipakai bersama semua scraper.
+
+    Key: (bahasa sumber, bahasa tujuan, teks). Aman dipakai dari beberapa
+    thread (lock + WAL) dan beberapa proses (busy timeout SQLite).
+    """
+
+    def __init__(self, path=DB_FILE, ttl_days=TTL_DAYS):
+        self.path = Path(path)
+        self.ttl = ttl_days * 86400 if ttl_days else None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+
+        self.evict_expired()
+
+    def evict_expired(self):
+        if not self.ttl:
+            return 0
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM translations WHERE updated_at < ?",
+                (time.time() - self.ttl,)
+            )
+        return cur.rowcount
+
+    def get_many(self, texts, source, target):
+        source, target = normalize_lang(source), normalize_lang(target)
+        texts = [t for t in dict.fromkeys(texts) if t]
+        found = {}
+
+        with self._lock:
+            # batas parameter SQLite, query per potongan
+            for i in range(0, len(texts), 500):
+                part = texts[i:i + 500]
+                rows = self._conn.execute(
+                    "SELECT text, translation FROM translations "
+                    f"WHERE source = ? AND target = ? AND text IN ({','.join('?' * len(part))})",
+                    (source, target, *part)
+                ).fetchall()
+                found.update(rows)
+
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+
+        return found
+
+    def get(self, text, source, target):
+        return self.get_many([text], source, target).get(text)
+
+    def put_many(self, pairs, source, target):
+        source, target = normalize_lang(source), normalize_lang(target)
+        now = time.time()
+        rows = [
+            (source, target, text, translation, now)
+            for text, translation in pairs.items()
+            if text and translation
+        ]
+        if not rows:
+            return
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO translations (source, target, text, translation, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, target, text) DO UPDATE SET "
+                "translation = excluded.translation, updated_at = excluded.updated_at",
+                rows
+            )
+            self.writes += len(rows)
+
+    def put(self, text, translation, source, target):
+        self.put_many({text: translation}, source, target)
+
+    def report(self):
+        # ke stderr supaya tidak tercampur output M3U di stdout
+        print(
+            f"🧠 Translation memory: {self.hits} hit, {self.misses} miss, "
+            f"{self.writes} disimpan ({self.path.name})",
+            file=sys.stderr
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_memory():
+    """Instance bersama per proses, statistik dicetak saat proses selesai."""
+    global _memory
+    with _memory_lock:
+        if _memory is None:
+            _memory = TranslationMemory()
+
+            def _finish():
+                _memory.report()
+                _memory.close()
+
+            atexit.register(_finish)
+    return _memory